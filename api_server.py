@@ -4,31 +4,180 @@ FastAPI Server for N8N Workflow Documentation
 High-performance API with sub-100ms response times.
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from pydantic_core import to_json
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 import json
 import os
+import zipfile
 import asyncio
+import datetime
+import hashlib
+import itertools
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
 import uvicorn
 from contextlib import asynccontextmanager
+from functools import lru_cache
+import aiofiles
+import aiofiles.os
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding of list responses
+    orjson = None
 
 from workflow_db import WorkflowDatabase
+from workflow_watcher import WorkflowWatcher
+from static_assets import AssetManifest, choose_encoding, compress_variants
 
 # Initialize database
 db = WorkflowDatabase()
 
+# Precompressed, content-hashed copies written by `python static_assets.py`
+assets = AssetManifest()
+
+# Mermaid diagrams kept in memory, keyed by the workflow's content hash
+DIAGRAM_CACHE_SIZE = 256
+
+# Seconds between checks of the categories file for changes
+CATEGORY_REFRESH_INTERVAL = 30
+
+# JSON documents larger than this are parsed off the event loop
+JSON_PARSE_OFFLOAD_BYTES = 256 * 1024
+
+async def read_json_file(file_path) -> Any:
+    """Read and parse a JSON file without blocking the event loop."""
+    async with aiofiles.open(file_path, 'rb') as f:
+        raw = await f.read()
+    if len(raw) > JSON_PARSE_OFFLOAD_BYTES:
+        return await db.run_async(json.loads, raw)
+    return json.loads(raw)
+
+# Filenames accepted by one /api/workflows/batch request, and how many of
+# their files are read at once when raw JSON is included
+BATCH_MAX_WORKFLOWS = 500
+BATCH_READ_CONCURRENCY = 16
+
+# ZIP downloads are read in chunks of this size and sent once at least this
+# much compressed output is buffered
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Read endpoints carry validators; shared caches may reuse a response this
+# long, after which revalidating it is a cheap 304
+API_CACHE_CONTROL = "public, max-age=60"
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already lists etag (weak comparison)."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    etag = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime.datetime] = None) -> bool:
+    """Evaluate a conditional GET; If-None-Match takes precedence over If-Modified-Since."""
+    if request.headers.get('if-none-match') is not None:
+        return etag_matches(request, etag)
+    since = request.headers.get('if-modified-since')
+    if since and last_modified is not None:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def cache_headers(etag: str, last_modified: Optional[datetime.datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": API_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+def encoded_response(request: Request, body: bytes, variants: Dict[str, bytes],
+                     media_type: str, headers: Dict[str, str]) -> Response:
+    """Send the precompressed variant the client accepts; GZipMiddleware leaves it alone."""
+    encoding = choose_encoding(request.headers.get('accept-encoding'), variants)
+    headers = dict(headers)
+    if encoding:
+        # Identity responses get their Vary from GZipMiddleware
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+    return Response(content=variants.get(encoding, body), media_type=media_type, headers=headers)
+
+# Encoded bodies of large, rarely changing JSON responses: one (etag, body,
+# variants) per endpoint, so they are serialized and compressed once per version
+_encoded_json: Dict[str, Tuple[str, bytes, Dict[str, bytes]]] = {}
+
+async def encoded_json(name: str, etag: str, build) -> Tuple[bytes, Dict[str, bytes]]:
+    cached = _encoded_json.get(name)
+    if cached is None or cached[0] != etag:
+        payload = await build()
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        cached = (etag, body, await db.run_async(compress_variants, body))
+        _encoded_json[name] = cached
+    return cached[1], cached[2]
+
+def not_modified(etag: str, last_modified: Optional[datetime.datetime] = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
+
+async def index_validators() -> Tuple[str, Optional[datetime.datetime]]:
+    """ETag and Last-Modified shared by every response derived from the index."""
+    generation, last_indexed = await db.get_index_version_async()
+    token = hashlib.blake2b(f"{app.version}:{generation}:{last_indexed}".encode('utf-8'), digest_size=8)
+    last_modified = None
+    if last_indexed:
+        try:
+            last_modified = datetime.datetime.fromisoformat(last_indexed).astimezone(datetime.timezone.utc)
+        except ValueError:
+            pass
+    return f'W/"{token.hexdigest()}"', last_modified
+
+def file_validators(*paths: Path) -> Tuple[str, Optional[datetime.datetime]]:
+    """ETag and Last-Modified for responses built from source files (missing ones included)."""
+    signature = []
+    last_modified = None
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            signature.append(f"{path}:-")
+            continue
+        signature.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        modified = datetime.datetime.fromtimestamp(st.st_mtime, datetime.timezone.utc)
+        last_modified = max(last_modified, modified) if last_modified else modified
+    token = hashlib.blake2b("|".join(signature).encode('utf-8'), digest_size=8)
+    return f'W/"{token.hexdigest()}"', last_modified
+
+def metadata_etag(workflow: Dict[str, Any]) -> str:
+    """ETag of a response carrying a workflow's index row, which can change while its file doesn't."""
+    token = hashlib.blake2b(json.dumps(workflow, sort_keys=True, default=str).encode('utf-8'), digest_size=8)
+    return f'W/"{token.hexdigest()}"'
+
+def watch_enabled() -> bool:
+    """Whether WORKFLOW_WATCH asks for live reindexing of the workflows directory."""
+    return os.environ.get('WORKFLOW_WATCH', '').lower() in ('1', 'true', 'yes', 'on')
+
+async def refresh_categories_periodically():
+    """Pick up edits to the categories file while the server runs."""
+    while True:
+        await asyncio.sleep(CATEGORY_REFRESH_INTERVAL)
+        try:
+            await db.run_async(db.refresh_categories)
+        except Exception as e:
+            print(f"⚠️ Category refresh failed: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     try:
-        stats = db.get_stats()
+        stats = await db.get_stats_async()
         if stats['total'] == 0:
             print("⚠️  Warning: No workflows found in database. Run indexing first.")
         else:
@@ -37,9 +186,21 @@ async def lifespan(app: FastAPI):
         print(f"❌ Database connection failed: {e}")
         raise
     
+    # Categories are imported here and in the background, never while serving a read
+    await db.run_async(db.refresh_categories)
+    category_refresh = asyncio.create_task(refresh_categories_periodically())
+    
+    watcher = None
+    if watch_enabled():
+        watcher = WorkflowWatcher(db)
+        watcher.start()
+    
     yield
     
     # Shutdown
+    category_refresh.cancel()
+    if watcher is not None:
+        watcher.stop()
     db.close()
 
 # Initialize FastAPI app with lifespan for local development
@@ -50,8 +211,24 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes requests under exclude_paths through untouched."""
+    
+    def __init__(self, app, minimum_size: int = 500, exclude_paths: Tuple[str, ...] = ()):
+        super().__init__(app, minimum_size=minimum_size)
+        self.exclude_paths = exclude_paths
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Paths whose responses are already compressed: hashed build outputs and ZIP downloads
+GZIP_EXCLUDED_PATHS = ("/assets/", "/api/workflows/download.zip")
+
 # Add middleware for performance
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000, exclude_paths=GZIP_EXCLUDED_PATHS)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -74,6 +251,7 @@ class WorkflowSummary(BaseModel):
     tags: List[str] = []
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    category: str = "Uncategorized"
     
     class Config:
         # Allow conversion of int to bool for active field
@@ -87,6 +265,16 @@ class WorkflowSummary(BaseModel):
         return v
     
 
+class IntegrationCount(BaseModel):
+    name: str
+    count: int
+
+class SearchFacets(BaseModel):
+    trigger_type: Dict[str, int]
+    complexity: Dict[str, int]
+    active: Dict[str, int]
+    integrations: List[IntegrationCount]
+
 class SearchResponse(BaseModel):
     workflows: List[WorkflowSummary]
     total: int
@@ -95,6 +283,53 @@ class SearchResponse(BaseModel):
     pages: int
     query: str
     filters: Dict[str, Any]
+    next_cursor: Optional[str] = None
+    facets: Optional[SearchFacets] = None
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by orjson (or pydantic-core), sent without re-validating against response_model."""
+    
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return to_json(content)
+
+def workflow_summary(workflow: Dict[str, Any]) -> Dict[str, Any]:
+    """A search row reduced to the WorkflowSummary fields, in JSON-ready form."""
+    return {
+        'id': workflow.get('id'),
+        'filename': workflow.get('filename') or '',
+        'name': workflow.get('name') or '',
+        'active': bool(workflow.get('active')),
+        'description': workflow.get('description') or '',
+        'trigger_type': workflow.get('trigger_type') or 'Manual',
+        'complexity': workflow.get('complexity') or 'low',
+        'node_count': workflow.get('node_count') or 0,
+        'integrations': workflow.get('integrations') or [],
+        'tags': workflow.get('tags') or [],
+        'created_at': workflow.get('created_at'),
+        'updated_at': workflow.get('updated_at'),
+        'category': workflow.get('category') or 'Uncategorized'
+    }
+
+class WorkflowSelection(BaseModel):
+    filenames: List[str] = Field(..., min_length=1)
+
+class BatchRequest(WorkflowSelection):
+    filenames: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_WORKFLOWS)
+    include_raw: bool = False
+
+class IntegrationsResponse(BaseModel):
+    integrations: List[IntegrationCount]
+    count: int
+
+class SimilarWorkflow(WorkflowSummary):
+    similarity: float
+
+class SimilarResponse(BaseModel):
+    filename: str
+    workflows: List[SimilarWorkflow]
+    count: int
 
 class StatsResponse(BaseModel):
     total: int
@@ -104,10 +339,10 @@ class StatsResponse(BaseModel):
     complexity: Dict[str, int]
     total_nodes: int
     unique_integrations: int
-    last_indexed: str
+    last_indexed: Optional[str] = None
 
 @dual_get("/")
-async def root():
+async def root(request: Request):
     """Serve the main landing page."""
     index_file = Path("index.html")
     if not index_file.exists():
@@ -118,10 +353,10 @@ async def root():
         <p>Current directory: """ + str(Path.cwd()) + """</p>
         </body></html>
         """)
-    return FileResponse(str(index_file))
+    return serve_asset(request, index_file)
 
 @dual_get("/workflows")
-async def workflows_documentation():
+async def workflows_documentation(request: Request):
     """Serve the professional workflow documentation page."""
     static_dir = Path("static")
     workflows_file = static_dir / "workflows_new.html"
@@ -130,7 +365,7 @@ async def workflows_documentation():
         fallback_file = static_dir / "workflows.html"
         if fallback_file.exists():
             print(f"✅ Using fallback workflows file at: {fallback_file}")
-            return FileResponse(str(fallback_file))
+            return serve_asset(request, fallback_file)
         
         return HTMLResponse("""
         <html><body>
@@ -141,7 +376,7 @@ async def workflows_documentation():
         <ul>""" + "".join([f"<li>{f.name}</li>" for f in Path("static").glob("*.html") if Path("static").exists()]) + """</ul>
         </body></html>
         """)
-    return FileResponse(str(workflows_file))
+    return serve_asset(request, workflows_file)
 
 @dual_get("/health")
 async def health_check():
@@ -149,156 +384,395 @@ async def health_check():
     return {"status": "healthy", "message": "N8N Workflow API is running"}
 
 @dual_get("/api/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request, response: Response):
     """Get workflow database statistics."""
     try:
-        stats = db.get_stats()
+        etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        
+        stats = await db.get_stats_async()
+        response.headers.update(cache_headers(etag, last_modified))
         return StatsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
 
+@dual_get("/api/stats/cache")
+async def get_cache_stats():
+    """Search result cache counters, for tuning WORKFLOW_CACHE_SIZE and WORKFLOW_CACHE_TTL."""
+    return JSONResponse(db.get_cache_stats(), headers={"Cache-Control": "no-store"})
+
 @dual_get("/api/workflows", response_model=SearchResponse)
 async def search_workflows(
+    request: Request,
     q: str = Query("", description="Search query"),
     trigger: str = Query("all", description="Filter by trigger type"),
     complexity: str = Query("all", description="Filter by complexity"),
+    integration: str = Query("all", description="Filter by integration (case-insensitive)"),
+    category: str = Query("all", description="Filter by workflow category (see /api/categories)"),
     active_only: bool = Query(False, description="Show only active workflows"),
     page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(20, ge=1, le=100, description="Items per page")
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    facets: bool = Query(False, description="Include counts per trigger, complexity, active state and integration over all matches"),
+    facet_integrations: int = Query(10, ge=1, le=100, description="Number of integrations listed in facets")
 ):
-    """Search and filter workflows with pagination."""
+    """Search and filter workflows with pagination, optionally with facet counts."""
     try:
-        offset = (page - 1) * per_page
+        etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
         
-        workflows, total = db.search_workflows(
+        search = dict(
             query=q,
             trigger_filter=trigger,
             complexity_filter=complexity,
             active_only=active_only,
-            limit=per_page,
-            offset=offset
+            integration_filter=integration,
+            category_filter=category
         )
+        if cursor:
+            page = db.decode_cursor(cursor)['page']
+        offset = (page - 1) * per_page
         
-        # Convert to Pydantic models with error handling
-        workflow_summaries = []
-        for workflow in workflows:
-            try:
-                # Remove extra fields that aren't in the model
-                clean_workflow = {
-                    'id': workflow.get('id'),
-                    'filename': workflow.get('filename', ''),
-                    'name': workflow.get('name', ''),
-                    'active': workflow.get('active', False),
-                    'description': workflow.get('description', ''),
-                    'trigger_type': workflow.get('trigger_type', 'Manual'),
-                    'complexity': workflow.get('complexity', 'low'),
-                    'node_count': workflow.get('node_count', 0),
-                    'integrations': workflow.get('integrations', []),
-                    'tags': workflow.get('tags', []),
-                    'created_at': workflow.get('created_at'),
-                    'updated_at': workflow.get('updated_at')
-                }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}")
-                # Continue with other workflows instead of failing completely
-                continue
+        page_task = db.search_workflows_async(
+            limit=per_page,
+            offset=offset,
+            cursor=cursor,
+            **search
+        )
+        if facets:
+            # Both run on the database executor, so the facet pass overlaps the page query
+            (workflows, total), facet_counts = await asyncio.gather(
+                page_task, db.get_search_facets_async(top_integrations=facet_integrations, **search))
+        else:
+            workflows, total = await page_task
         
         pages = (total + per_page - 1) // per_page  # Ceiling division
         
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=q,
-            filters={
+        # Rows go straight to JSON in the SearchResponse shape, skipping
+        # per-row WorkflowSummary models and response_model re-validation
+        content = {
+            "workflows": [workflow_summary(workflow) for workflow in workflows],
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "query": q,
+            "filters": {
                 "trigger": trigger,
                 "complexity": complexity,
+                "integration": integration,
+                "category": category,
                 "active_only": active_only
-            }
-        )
+            },
+            "next_cursor": db.next_cursor(workflows, page, per_page, total, **search)
+        }
+        if facets:
+            content["facets"] = facet_counts
+        return FastJSONResponse(content, headers=cache_headers(etag, last_modified))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching workflows: {str(e)}")
+
+@dual_post("/api/workflows/batch")
+async def get_workflows_batch(batch: BatchRequest):
+    """Metadata, and optionally raw JSON, of several workflows in request order; unknown or unreadable ones are listed as "missing"."""
+    try:
+        filenames = list(dict.fromkeys(batch.filenames))
+        found = await db.get_workflows_async(filenames)
+        workflows = [{"metadata": workflow} for workflow in found.values()]
+        
+        if batch.include_raw:
+            file_paths = await db.run_async(lambda: [db.workflow_file_path(w) for w in found.values()])
+            semaphore = asyncio.Semaphore(BATCH_READ_CONCURRENCY)
+            
+            async def load(file_path: Optional[str]) -> Any:
+                if file_path is None:
+                    return None
+                async with semaphore:
+                    try:
+                        return await read_json_file(file_path)
+                    except FileNotFoundError:
+                        print(f"Warning: File {file_path} not found on filesystem but exists in database")
+                        return None
+            
+            raw_jsons = await asyncio.gather(*(load(file_path) for file_path in file_paths))
+            for entry, raw_json in zip(workflows, raw_jsons):
+                entry["raw_json"] = raw_json
+            workflows = [entry for entry in workflows if entry["raw_json"] is not None]
+        
+        returned = {entry["metadata"]["filename"] for entry in workflows}
+        return FastJSONResponse({
+            "workflows": workflows,
+            "missing": [name for name in filenames if name not in returned],
+            "count": len(workflows)
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading workflows: {str(e)}")
+
+class _ZipBuffer:
+    """Write-only sink for zipfile.ZipFile; the archive is sent as it's drained."""
+    
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+def zip_workflows(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """ZIP archive of the workflow files in batches, yielded as it is written instead of held whole."""
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for batch in batches:
+            for workflow in batch:
+                file_path = db.workflow_file_path(workflow)
+                if file_path is None:
+                    continue
+                try:
+                    info = zipfile.ZipInfo.from_file(file_path, workflow["filename"], strict_timestamps=False)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with open(file_path, "rb") as source, archive.open(info, "w") as target:
+                        while chunk := source.read(ZIP_CHUNK_SIZE):
+                            target.write(chunk)
+                            if buffer.size >= ZIP_CHUNK_SIZE:
+                                yield buffer.drain()
+                except FileNotFoundError:
+                    print(f"Warning: File {file_path} not found on filesystem but exists in database")
+                    continue
+                if buffer.size >= ZIP_CHUNK_SIZE:
+                    yield buffer.drain()
+    yield buffer.drain()
+
+@dual_get("/api/workflows/download.zip")
+async def download_workflows_zip(
+    filename: List[str] = Query([], description="Workflows to include; without any, every workflow matching the filters"),
+    q: str = Query("", description="Search query"),
+    trigger: str = Query("all", description="Filter by trigger type"),
+    complexity: str = Query("all", description="Filter by complexity"),
+    integration: str = Query("all", description="Filter by integration (case-insensitive)"),
+    category: str = Query("all", description="Filter by workflow category (see /api/categories)"),
+    active_only: bool = Query(False, description="Show only active workflows")
+):
+    """Download several workflow files as one ZIP archive, streamed as it's built."""
+    if filename:
+        return zip_response(selected_workflows(filename))
+    
+    batches = db.iter_workflows(
+        query=q,
+        trigger_filter=trigger,
+        complexity_filter=complexity,
+        active_only=active_only,
+        integration_filter=integration,
+        category_filter=category
+    )
+    # Run the first query up front so a bad search fails with an error
+    # status instead of a truncated archive
+    try:
+        first = await db.run_async(next, batches, [])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching workflows: {str(e)}")
+    batches = itertools.chain([first], batches)
+    return zip_response(batches)
+
+@dual_post("/api/workflows/download.zip")
+async def download_selected_workflows_zip(selection: WorkflowSelection):
+    """Download the listed workflow files as one ZIP archive; for selections too long for a URL."""
+    return zip_response(selected_workflows(selection.filenames))
+
+def selected_workflows(filenames: List[str]) -> Iterator[List[Dict[str, Any]]]:
+    """Metadata of the given workflows in request order, BATCH_MAX_WORKFLOWS at a time."""
+    filenames = list(dict.fromkeys(filenames))
+    return (
+        list(db.get_workflows(filenames[i:i + BATCH_MAX_WORKFLOWS]).values())
+        for i in range(0, len(filenames), BATCH_MAX_WORKFLOWS)
+    )
+
+def zip_response(batches: Iterable[List[Dict[str, Any]]]) -> StreamingResponse:
+    # A sync iterator: Starlette advances it on a worker thread, so file
+    # reads, queries and compression stay off the event loop
+    return StreamingResponse(
+        zip_workflows(batches),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="workflows.zip"'}
+    )
+
+@dual_get("/api/export.ndjson")
+async def export_workflows(
+    request: Request,
+    q: str = Query("", description="Search query"),
+    trigger: str = Query("all", description="Filter by trigger type"),
+    complexity: str = Query("all", description="Filter by complexity"),
+    integration: str = Query("all", description="Filter by integration (case-insensitive)"),
+    category: str = Query("all", description="Filter by workflow category (see /api/categories)"),
+    active_only: bool = Query(False, description="Show only active workflows")
+):
+    """Every workflow matching the filters as newline-delimited JSON, streamed in id order."""
+    etag, last_modified = await index_validators()
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    chunks = db.export_ndjson(
+        query=q,
+        trigger_filter=trigger,
+        complexity_filter=complexity,
+        active_only=active_only,
+        integration_filter=integration,
+        category_filter=category
+    )
+    # Run the first query up front so a bad search fails with an error
+    # status instead of a truncated export
+    try:
+        first = await db.run_async(next, chunks, b"")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting workflows: {str(e)}")
+    
+    return StreamingResponse(
+        itertools.chain([first], chunks),
+        media_type="application/x-ndjson",
+        headers=cache_headers(etag, last_modified)
+    )
+
+async def resolve_workflow_path(filename: str, workflow: Optional[Dict[str, Any]] = None) -> Path:
+    """Indexed filename (or its already fetched workflow) -> file path; raises a 404 if it isn't indexed or is gone."""
+    if workflow is not None:
+        # Legacy rows without file_path scan the workflows directory
+        file_path = await db.run_async(db.workflow_file_path, workflow)
+    else:
+        file_path = await db.get_workflow_path_async(filename)
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Workflow not found in database")
+    if not await aiofiles.os.path.exists(file_path):
+        print(f"Warning: File {file_path} not found on filesystem but exists in database")
+        raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
+    return Path(file_path)
 
 @dual_get("/api/workflows/{filename}")
-async def get_workflow_detail(filename: str):
+async def get_workflow_detail(filename: str, request: Request):
     """Get detailed workflow information including raw JSON."""
     try:
         # Get workflow metadata from database
-        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
-        if not workflows:
+        workflow_meta = await db.get_workflow_async(filename)
+        if workflow_meta is None:
             raise HTTPException(status_code=404, detail="Workflow not found in database")
         
-        workflow_meta = workflows[0]
+        # Validated by the metadata served (file_hash included): a 304 skips reading the file
+        etag = metadata_etag(workflow_meta)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
         
-        # file_path = Path(__file__).parent / "workflows" / workflow_meta.name / filename
-        # print(f"当前工作目录: {workflow_meta}")
         # Load raw JSON from file
-        workflows_path = Path('workflows')
-        json_files = list(workflows_path.rglob("*.json"))
-        file_path = [f for f in json_files if f.name == filename][0]
-        if not file_path.exists():
-            print(f"Warning: File {file_path} not found on filesystem but exists in database")
-            raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
+        file_path = await resolve_workflow_path(filename, workflow_meta)
+        raw_json = await read_json_file(file_path)
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            raw_json = json.load(f)
-        
-        return {
+        return JSONResponse({
             "metadata": workflow_meta,
             "raw_json": raw_json
-        }
+        }, headers=cache_headers(etag))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading workflow: {str(e)}")
 
 @dual_get("/api/workflows/{filename}/download")
-async def download_workflow(filename: str):
+async def download_workflow(filename: str, request: Request):
     """Download workflow JSON file."""
     try:
-        workflows_path = Path('workflows')
-        json_files = list(workflows_path.rglob("*.json"))
-        file_path = [f for f in json_files if f.name == filename][0]
-        if not os.path.exists(file_path):
-            print(f"Warning: Download requested for missing file: {file_path}")
-            raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
+        workflow = await db.get_workflow_async(filename)
+        if workflow is None:
+            raise HTTPException(status_code=404, detail="Workflow not found in database")
+        
+        etag = f'"{workflow["file_hash"]}"'
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        
+        file_path = await resolve_workflow_path(filename, workflow)
         
         return FileResponse(
             file_path,
             media_type="application/json",
-            filename=filename
+            filename=filename,
+            headers=cache_headers(etag)
         )
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found")
     except Exception as e:
         print(f"Error downloading workflow {filename}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error downloading workflow: {str(e)}")
 
+@lru_cache(maxsize=DIAGRAM_CACHE_SIZE)
+def cached_mermaid_diagram(file_hash: str, file_path: str) -> str:
+    """Mermaid code for the workflow whose content hashes to file_hash; an entry never goes stale."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    nodes = data.get('nodes', [])
+    connections = data.get('connections', {})
+    
+    return generate_mermaid_diagram(nodes, connections)
+
+@dual_get("/api/workflows/{filename}/similar", response_model=SimilarResponse)
+async def get_similar_workflows(
+    filename: str,
+    request: Request,
+    k: int = Query(10, ge=1, le=50, description="Number of similar workflows")
+):
+    """Workflows most similar to this one by node types, integrations and name (TF-IDF cosine)."""
+    if not db.similarity.available():
+        raise HTTPException(status_code=503, detail="Similar workflows need numpy: pip install numpy")
+    try:
+        etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        
+        similar = await db.get_similar_workflows_async(filename, k)
+        if similar is None:
+            raise HTTPException(status_code=404, detail="Workflow not found in database")
+        
+        return FastJSONResponse({
+            "filename": filename,
+            "workflows": [{**workflow_summary(workflow), "similarity": workflow["similarity"]}
+                          for workflow in similar],
+            "count": len(similar)
+        }, headers=cache_headers(etag, last_modified))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error finding similar workflows: {str(e)}")
+
 @dual_get("/api/workflows/{filename}/diagram")
-async def get_workflow_diagram(filename: str):
+async def get_workflow_diagram(filename: str, request: Request):
     """Get Mermaid diagram code for workflow visualization."""
     try:
-        workflows_path = Path('workflows')
-        json_files = list(workflows_path.rglob("*.json"))
-        file_path = [f for f in json_files if f.name == filename][0]
-        print(f'{file_path}')
-        if not file_path.exists():
-            print(f"Warning: Diagram requested for missing file: {file_path}")
-            raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
+        workflow = await db.get_workflow_async(filename)
+        if workflow is None:
+            raise HTTPException(status_code=404, detail="Workflow not found in database")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        etag = f'"{workflow["file_hash"]}"'
+        if is_not_modified(request, etag):
+            return not_modified(etag)
         
-        nodes = data.get('nodes', [])
-        connections = data.get('connections', {})
+        file_path = await resolve_workflow_path(filename, workflow)
         
-        # Generate Mermaid diagram
-        diagram = generate_mermaid_diagram(nodes, connections)
+        # Generate Mermaid diagram (or reuse the one for this content) off the event loop
+        diagram = await db.run_async(cached_mermaid_diagram, workflow['file_hash'], str(file_path))
         
-        return {"diagram": diagram}
+        return JSONResponse({"diagram": diagram}, headers=cache_headers(etag))
     except HTTPException:
         raise
     except FileNotFoundError:
@@ -387,70 +861,72 @@ async def reindex_workflows(background_tasks: BackgroundTasks, force: bool = Fal
     background_tasks.add_task(run_indexing)
     return {"message": "Reindexing started in background"}
 
-@dual_get("/api/integrations")
-async def get_integrations():
-    """Get list of all unique integrations."""
+@dual_get("/api/integrations", response_model=IntegrationsResponse)
+async def get_integrations(
+    request: Request,
+    prefix: str = Query("", description="Only integrations starting with this (case-insensitive)"),
+    sort: str = Query("count", pattern="^(count|name)$", description="Order by workflow count or by name")
+):
+    """Get every integration with the number of workflows using it."""
     try:
-        stats = db.get_stats()
-        # For now, return basic info. Could be enhanced to return detailed integration stats
-        return {"integrations": [], "count": stats['unique_integrations']}
+        etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        headers = cache_headers(etag, last_modified)
+        
+        async def build_integrations():
+            integrations = await db.get_integrations_async(prefix, sort)
+            return {"integrations": integrations, "count": len(integrations)}
+        
+        if not prefix:
+            # The full list backs the integration picker: encode it once per version
+            body, variants = await encoded_json(f"integrations:{sort}", etag, build_integrations)
+            return encoded_response(request, body, variants, "application/json", headers)
+        return FastJSONResponse(await build_integrations(), headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching integrations: {str(e)}")
 
 @dual_get("/api/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """Get available workflow categories for filtering."""
     try:
-        # Try to load from the generated unique categories file
+        # A generated unique categories file takes precedence over the imported mappings
         categories_file = Path("context/unique_categories.json")
         if categories_file.exists():
-            with open(categories_file, 'r', encoding='utf-8') as f:
-                categories = json.load(f)
-            return {"categories": categories}
+            etag, last_modified = file_validators(categories_file)
         else:
-            # Fallback: extract categories from search_categories.json
-            search_categories_file = Path("context/search_categories.json")
-            if search_categories_file.exists():
-                with open(search_categories_file, 'r', encoding='utf-8') as f:
-                    search_data = json.load(f)
-                
-                unique_categories = set()
-                for item in search_data:
-                    if item.get('category'):
-                        unique_categories.add(item['category'])
-                    else:
-                        unique_categories.add('Uncategorized')
-                
-                categories = sorted(list(unique_categories))
-                return {"categories": categories}
-            else:
-                # Last resort: return basic categories
-                return {"categories": ["Uncategorized"]}
+            etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        
+        async def build_categories():
+            if categories_file.exists():
+                return {"categories": await read_json_file(categories_file)}
+            return {"categories": await db.get_categories_async()}
+        
+        body, variants = await encoded_json("categories", etag, build_categories)
+        return encoded_response(request, body, variants, "application/json",
+                                cache_headers(etag, last_modified))
                 
     except Exception as e:
         print(f"Error loading categories: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching categories: {str(e)}")
 
 @dual_get("/api/category-mappings")
-async def get_category_mappings():
+async def get_category_mappings(request: Request):
     """Get filename to category mappings for client-side filtering."""
     try:
-        search_categories_file = Path("context/search_categories.json")
-        if not search_categories_file.exists():
-            return {"mappings": {}}
-        
-        with open(search_categories_file, 'r', encoding='utf-8') as f:
-            search_data = json.load(f)
+        # Imported from context/search_categories.json; an import bumps the index version
+        etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
         
-        # Convert to a simple filename -> category mapping
-        mappings = {}
-        for item in search_data:
-            filename = item.get('filename')
-            category = item.get('category') or 'Uncategorized'
-            if filename:
-                mappings[filename] = category
+        async def build_mappings():
+            return {"mappings": await db.get_category_mappings_async()}
         
-        return {"mappings": mappings}
+        body, variants = await encoded_json("category-mappings", etag, build_mappings)
+        return encoded_response(request, body, variants, "application/json",
+                                cache_headers(etag, last_modified))
         
     except Exception as e:
         print(f"Error loading category mappings: {e}")
@@ -458,54 +934,43 @@ async def get_category_mappings():
 
 @dual_get("/api/workflows/category/{category}", response_model=SearchResponse)
 async def search_workflows_by_category(
+    request: Request,
     category: str,
     page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(20, ge=1, le=100, description="Items per page")
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page")
 ):
     """Search workflows by service category (messaging, database, ai_ml, etc.)."""
     try:
+        etag, last_modified = await index_validators()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        
+        if cursor:
+            page = db.decode_cursor(cursor)['page']
         offset = (page - 1) * per_page
         
-        workflows, total = db.search_by_category(
+        workflows, total = await db.search_by_category_async(
             category=category,
             limit=per_page,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
         
-        # Convert to Pydantic models with error handling
-        workflow_summaries = []
-        for workflow in workflows:
-            try:
-                clean_workflow = {
-                    'id': workflow.get('id'),
-                    'filename': workflow.get('filename', ''),
-                    'name': workflow.get('name', ''),
-                    'active': workflow.get('active', False),
-                    'description': workflow.get('description', ''),
-                    'trigger_type': workflow.get('trigger_type', 'Manual'),
-                    'complexity': workflow.get('complexity', 'low'),
-                    'node_count': workflow.get('node_count', 0),
-                    'integrations': workflow.get('integrations', []),
-                    'tags': workflow.get('tags', []),
-                    'created_at': workflow.get('created_at'),
-                    'updated_at': workflow.get('updated_at')
-                }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}")
-                continue
-        
         pages = (total + per_page - 1) // per_page
         
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=f"category:{category}",
-            filters={"category": category}
-        )
+        return FastJSONResponse({
+            "workflows": [workflow_summary(workflow) for workflow in workflows],
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "query": f"category:{category}",
+            "filters": {"category": category},
+            "next_cursor": db.next_cursor(workflows, page, per_page, total, category=category)
+        }, headers=cache_headers(etag, last_modified))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching by category: {str(e)}")
 
@@ -518,23 +983,80 @@ async def global_exception_handler(request, exc):
     )
 
 # Mount static files AFTER all routes are defined
+STATIC_MEDIA_TYPES = {
+    '.html': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.jpeg': 'image/jpeg',
+    '.jpg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.svg': 'image/svg+xml',
+    '.json': 'application/json',
+    '.txt': 'text/plain'
+}
+
+# Unversioned URLs are revalidated on every use; hashed /assets/ URLs never change
+ASSET_CACHE_CONTROL = "no-cache"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def media_type_for(path: Path) -> str:
+    return STATIC_MEDIA_TYPES.get(path.suffix.lower(), 'application/octet-stream')
+
+def asset_response(request: Request, entry: Dict[str, Any], media_type: str, cache_control: str) -> Response:
+    """Serve a built asset from static/dist, picking the .br/.gz copy from Accept-Encoding."""
+    etag = f'"{entry["hash"]}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={**headers, "Vary": "Accept-Encoding"})
+    path, encoding = assets.variant(entry, request.headers.get('accept-encoding'))
+    if encoding:
+        # Identity responses get their Vary from GZipMiddleware
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+    return FileResponse(str(path), media_type=media_type, headers=headers)
+
+def serve_asset(request: Request, file_path: Path, media_type: Optional[str] = None) -> Response:
+    """Serve a source file, through its precompressed build when that is current."""
+    media_type = media_type or media_type_for(file_path)
+    entry = assets.lookup(file_path.as_posix())
+    if entry is not None:
+        return asset_response(request, entry, media_type, ASSET_CACHE_CONTROL)
+    return FileResponse(str(file_path), media_type=media_type)
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers the precompressed build of a file when one is current."""
+    
+    async def get_response(self, path: str, scope) -> Response:
+        entry = assets.lookup(f"static/{Path(path).as_posix()}")
+        if entry is not None and scope["method"] in ("GET", "HEAD"):
+            return asset_response(Request(scope), entry, media_type_for(Path(path)), ASSET_CACHE_CONTROL)
+        return await super().get_response(path, scope)
+
 # Mount specific file types at root level for direct access
 @app.get("/styles.css")
-async def serve_styles():
+async def serve_styles(request: Request):
     """Serve the main CSS file."""
     css_file = Path("styles.css")
     if css_file.exists():
-        return FileResponse(str(css_file), media_type="text/css")
+        return serve_asset(request, css_file, "text/css")
     raise HTTPException(status_code=404, detail="CSS file not found")
 
 @dual_get("/scripts.js")
-async def serve_scripts():
+async def serve_scripts(request: Request):
     """Serve the main JavaScript file."""
     js_file = Path("scripts.js")
     if js_file.exists():
-        return FileResponse(str(js_file), media_type="application/javascript")
+        return serve_asset(request, js_file, "application/javascript")
     raise HTTPException(status_code=404, detail="JavaScript file not found")
 
+@dual_get("/assets/{name}")
+async def serve_hashed_asset(name: str, request: Request):
+    """Serve a content-hashed build output; the URL changes with the content, so it is cached forever."""
+    entry = assets.by_file(name)
+    if entry is None or not (assets.out_dir / name).is_file():
+        raise HTTPException(status_code=404, detail=f"Asset {name} not found")
+    return asset_response(request, entry, media_type_for(Path(name)), IMMUTABLE_CACHE_CONTROL)
+
 @dual_get("/bg.jpeg")
 async def serve_background():
     """Serve the background image."""
@@ -552,26 +1074,11 @@ async def serve_background():
 
 # Additional asset routes for static files
 @dual_get("/static/{filename}")
-async def serve_static_file(filename: str):
+async def serve_static_file(filename: str, request: Request):
     """Serve files from static directory."""
     file_path = Path("static") / filename
     if file_path.exists() and file_path.is_file():
-        # Determine media type based on extension
-        suffix = file_path.suffix.lower()
-        media_types = {
-            '.html': 'text/html',
-            '.css': 'text/css',
-            '.js': 'application/javascript',
-            '.jpeg': 'image/jpeg',
-            '.jpg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.svg': 'image/svg+xml',
-            '.json': 'application/json',
-            '.txt': 'text/plain'
-        }
-        media_type = media_types.get(suffix, 'application/octet-stream')
-        return FileResponse(str(file_path), media_type=media_type)
+        return serve_asset(request, file_path)
     raise HTTPException(status_code=404, detail=f"File {filename} not found")
 
 # Mount the static directory for fallback access
@@ -582,7 +1089,7 @@ print(f"✅ Static routes configured for {current_dir.absolute()}")
 if static_subdir.exists():
     print(f"✅ Static directory found at {static_subdir.absolute()}")
     # Mount for alternative access patterns
-    app.mount("/files", StaticFiles(directory="static"), name="files")
+    app.mount("/files", PrecompressedStaticFiles(directory="static"), name="files")
     print(f"✅ Alternative static files mounted at /files/")
 
 def create_static_directory():
@@ -645,8 +1152,11 @@ if __name__ == "__main__":
     parser.add_argument('--host', default=os.getenv('HOST', '127.0.0.1'), help='Host to bind to')
     parser.add_argument('--port', type=int, default=int(os.getenv('PORT', 8000)), help='Port to bind to')
     parser.add_argument('--reload', action='store_true', help='Enable auto-reload for development')
+    parser.add_argument('--watch', action='store_true', help='Reindex workflows automatically as files change')
     
     args = parser.parse_args()
+    if args.watch:
+        os.environ['WORKFLOW_WATCH'] = '1'
     
     run_server(host=args.host, port=args.port, reload=args.reload)
 
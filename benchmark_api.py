@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+API Concurrency Benchmark
+Drives a running api_server with many concurrent clients and reports latency percentiles.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Dict, List
+
+try:
+    import httpx
+except ImportError:  # optional: only needed to run this benchmark
+    httpx = None
+
+# Search terms for the "heavy" clients; pages and filters vary so the result
+# cache (disable it with WORKFLOW_CACHE_SIZE=0 on the server) rarely hits
+SEARCH_TERMS = ['slack', 'email', 'google', 'telegram', 'http', 'webhook',
+                'sheets', 'openai', 'notion', 'discord', 'github', 'stripe']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+async def run_client(client, base_url: str, client_id: int, requests: int,
+                     heavy_every: int, latencies: Dict[str, List[float]]):
+    """One client issuing requests back to back: every heavy_every-th client searches, the rest read stats."""
+    rnd = random.Random(client_id)
+    heavy = client_id % heavy_every == 0
+    for _ in range(requests):
+        if heavy:
+            kind, path = 'search', '/api/workflows'
+            params = {
+                'q': rnd.choice(SEARCH_TERMS),
+                'complexity': rnd.choice(['all', 'low', 'medium']),
+                'page': rnd.randint(1, 50),
+                'per_page': 20
+            }
+        else:
+            kind, path, params = 'stats', '/api/stats', None
+
+        start = time.perf_counter()
+        response = await client.get(base_url + path, params=params)
+        latencies[kind].append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+
+
+async def run_benchmark(base_url: str, clients: int, requests: int, heavy_every: int) -> Dict[str, List[float]]:
+    latencies = {'search': [], 'stats': []}
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+        await asyncio.gather(*(
+            run_client(client, base_url, i, requests, heavy_every, latencies)
+            for i in range(clients)
+        ))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrency benchmark for the workflow API')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of a running api_server')
+    parser.add_argument('--clients', type=int, default=200, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=10, help='Requests per client')
+    parser.add_argument('--heavy-every', type=int, default=10,
+                        help='Every Nth client runs searches, the others read /api/stats')
+    args = parser.parse_args()
+
+    if httpx is None:
+        print("❌ httpx is required: pip install httpx")
+        sys.exit(1)
+
+    print(f"🚀 {args.clients} clients x {args.requests} requests against {args.url}")
+    start = time.perf_counter()
+    latencies = asyncio.run(run_benchmark(args.url.rstrip('/'), args.clients, args.requests, args.heavy_every))
+    elapsed = time.perf_counter() - start
+
+    total = 0
+    for kind, values in latencies.items():
+        values.sort()
+        total += len(values)
+        print(f"📊 {kind:6} n={len(values):5}  p50={percentile(values, 50):8.1f}ms  "
+              f"p99={percentile(values, 99):8.1f}ms  max={values[-1] if values else 0:8.1f}ms")
+    print(f"⏱️  {total} requests in {elapsed:.1f}s ({total / elapsed:.0f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import json
 import os
 from pathlib import Path
 from workflow_db import WorkflowDatabase
+from static_assets import build_assets
 
 def generate_static_site():
     """Generate static HTML site for Netlify deployment"""
@@ -232,6 +233,10 @@ def generate_static_site():
             import shutil
             shutil.copy2(src_file, static_dir / file_name)
     
+    # Hashed, precompressed copies the API server sends instead of gzipping per request
+    print("📦 Precompressing static assets...")
+    build_assets()
+    
     print(f"✅ Static site generated in {static_dir}")
     print(f"📊 Total workflows: {stats['total']}")
     print(f"🚀 Ready for Netlify deployment!")
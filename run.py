@@ -54,7 +54,7 @@ def setup_directories():
     print("✅ Directories verified")
 
 
-def setup_database(force_reindex: bool = False) -> str:
+def setup_database(force_reindex: bool = False, jobs: int = 1) -> str:
     """Setup and initialize the database."""
     from workflow_db import WorkflowDatabase
     
@@ -67,8 +67,8 @@ def setup_database(force_reindex: bool = False) -> str:
     stats = db.get_stats()
     if stats['total'] == 0 or force_reindex:
         print("📚 Indexing workflows...")
-        index_stats = db.index_all_workflows(force_reindex=True)
-        print(f"✅ Indexed {index_stats['processed']} workflows")
+        index_stats = db.index_all_workflows(force_reindex=True, jobs=jobs)
+        print(f"✅ Indexed {index_stats['processed']} workflows ({index_stats.get('files_per_sec', 0):.0f} processed/sec)")
         
         # Show final stats
         final_stats = db.get_stats()
@@ -79,7 +79,7 @@ def setup_database(force_reindex: bool = False) -> str:
     return db_path
 
 
-def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
+def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False, watch: bool = False):
     """Start the FastAPI server."""
     print(f"🌐 Starting server at http://{host}:{port}")
     print(f"📊 API Documentation: http://{host}:{port}/docs")
@@ -90,6 +90,8 @@ def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False
     
     # Configure database path
     os.environ['WORKFLOW_DB_PATH'] = "database/workflows.db"
+    if watch:
+        os.environ['WORKFLOW_WATCH'] = "1"
     
     # Start uvicorn with better configuration
     import uvicorn
@@ -114,7 +116,9 @@ Examples:
   python run.py --port 3000        # Start on port 3000
   python run.py --host 0.0.0.0     # Accept external connections
   python run.py --reindex          # Force database reindexing
+  python run.py --reindex --jobs 0 # Reindex using every CPU core
   python run.py --dev              # Development mode with auto-reload
+  python run.py --watch            # Reindex workflows as files change
         """
     )
     
@@ -134,6 +138,17 @@ Examples:
         action="store_true", 
         help="Force database reindexing"
     )
+    parser.add_argument(
+        "--jobs", 
+        type=int, 
+        default=1, 
+        help="Worker processes for indexing (default: 1, 0 = all CPU cores)"
+    )
+    parser.add_argument(
+        "--watch", 
+        action="store_true", 
+        help="Reindex workflows automatically as files change"
+    )
     parser.add_argument(
         "--dev", 
         action="store_true", 
@@ -153,7 +168,7 @@ Examples:
     
     # Setup database
     try:
-        setup_database(force_reindex=args.reindex)
+        setup_database(force_reindex=args.reindex, jobs=args.jobs)
     except Exception as e:
         print(f"❌ Database setup error: {e}")
         sys.exit(1)
@@ -163,7 +178,8 @@ Examples:
         start_server(
             host=args.host, 
             port=args.port, 
-            reload=args.dev
+            reload=args.dev,
+            watch=args.watch
         )
     except KeyboardInterrupt:
         print("\n👋 Server stopped!")
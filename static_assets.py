@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Precompressed Static Assets
+Builds content-hashed, pre-gzipped (and brotli) copies of the front-end assets
+so the server can send them as-is instead of compressing on every request.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: .br variants are skipped, gzip is always built
+    brotli = None
+
+# Where the hashed copies, their .gz/.br variants and manifest.json are written
+ASSET_DIR = Path("static/dist")
+MANIFEST_NAME = "manifest.json"
+
+# Assets served from the repository root; everything compressible directly
+# inside static/ is picked up as well
+ROOT_ASSETS = ["styles.css", "scripts.js", "index.html"]
+COMPRESSIBLE_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg', '.txt'}
+
+# Same threshold as the server's GZipMiddleware: smaller files aren't worth it
+MIN_COMPRESS_SIZE = 1000
+
+# Preferred first when a client accepts several encodings equally
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# href/src attributes in HTML pages that may point at a hashed asset
+_ASSET_REFERENCE = re.compile(r'''\b(href|src)=(["'])([^"'#?:]+)\2''')
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=6).hexdigest()
+
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """gzip (and brotli, when installed) encodings of data, keeping only those that are smaller."""
+    variants = {}
+    if len(data) < MIN_COMPRESS_SIZE:
+        return variants
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    # mtime=0 keeps the output byte-identical across builds
+    variants['gzip'] = gzip.compress(data, compresslevel=9, mtime=0)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Best of the available encodings the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODING_SUFFIXES:
+        if encoding not in available:
+            continue
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def default_sources(root: Path = Path(".")) -> List[Path]:
+    sources = [root / name for name in ROOT_ASSETS]
+    static_dir = root / "static"
+    if static_dir.is_dir():
+        sources.extend(sorted(
+            path for path in static_dir.iterdir()
+            if path.is_file() and path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+        ))
+    return [path for path in sources if path.is_file()]
+
+
+def _source_key(path: Path, root: Path) -> str:
+    return Path(os.path.relpath(path, root)).as_posix()
+
+
+def _rewrite_references(html: str, page_key: str, manifest: Dict[str, Dict]) -> Tuple[str, List[str]]:
+    """Point href/src attributes at hashed assets; returns the page and the source keys it now depends on."""
+    page_dir = os.path.dirname(page_key)
+    dependencies = []
+
+    def replace(match):
+        reference = match.group(3)
+        if reference.startswith('/'):
+            key = reference.lstrip('/')
+        else:
+            key = os.path.normpath(os.path.join(page_dir, reference)).replace(os.sep, '/')
+        entry = manifest.get(key)
+        if entry is None or key.endswith('.html'):
+            return match.group(0)
+        dependencies.append(key)
+        return f'{match.group(1)}={match.group(2)}/assets/{entry["file"]}{match.group(2)}'
+
+    return _ASSET_REFERENCE.sub(replace, html), dependencies
+
+
+def build_assets(sources: Optional[Iterable[Path]] = None, out_dir: Path = ASSET_DIR,
+                 root: Path = Path(".")) -> Dict[str, Dict]:
+    """Write hashed copies and compressed variants of sources plus manifest.json, removing stale outputs."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sources = [Path(path) for path in (sources if sources is not None else default_sources(root))]
+    # Assets before pages, so pages can reference their hashed names
+    sources.sort(key=lambda path: path.suffix.lower() == '.html')
+
+    manifest = {}
+    written = {MANIFEST_NAME}
+    for source in sources:
+        key = _source_key(source, root)
+        st = source.stat()
+        data = source.read_bytes()
+        dependencies = []
+        if source.suffix.lower() == '.html':
+            html, dependencies = _rewrite_references(data.decode('utf-8'), key, manifest)
+            data = html.encode('utf-8')
+
+        digest = content_hash(data)
+        name = f"{source.stem}.{digest}{source.suffix}"
+        variants = compress_variants(data)
+        for encoding, body in [(None, data)] + list(variants.items()):
+            filename = name + ENCODING_SUFFIXES.get(encoding, '')
+            target = out_dir / filename
+            if not target.exists():
+                target.write_bytes(body)
+            written.add(filename)
+
+        manifest[key] = {
+            "file": name,
+            "hash": digest,
+            "encodings": sorted(variants),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "depends": dependencies
+        }
+        savings = ", ".join(f"{encoding} {len(body) * 100 // len(data)}%" for encoding, body in variants.items())
+        print(f"📦 {key} -> {name} ({len(data)} bytes{'; ' + savings if savings else ''})")
+
+    for stale in out_dir.iterdir():
+        if stale.is_file() and stale.name not in written:
+            stale.unlink()
+
+    tmp_path = out_dir / (MANIFEST_NAME + '.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp_path, out_dir / MANIFEST_NAME)
+    return manifest
+
+
+class AssetManifest:
+    """Read side of build_assets: the manifest, reloaded on change, minus entries whose sources changed."""
+
+    def __init__(self, out_dir: Path = ASSET_DIR, root: Path = Path(".")):
+        self.out_dir = Path(out_dir)
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._entries: Dict[str, Dict] = {}
+        self._files: Dict[str, Dict] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            st = os.stat(self.out_dir / MANIFEST_NAME)
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        with self._lock:
+            if signature != self._signature:
+                entries = {}
+                if signature is not None:
+                    try:
+                        entries = json.loads((self.out_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ Ignoring unreadable asset manifest: {e}")
+                self._entries = entries
+                self._files = {entry["file"]: entry for entry in entries.values()}
+                self._signature = signature
+            return self._entries
+
+    def _is_fresh(self, key: str, entry: Dict) -> bool:
+        try:
+            st = os.stat(self.root / key)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == (entry["size"], entry["mtime_ns"])
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Manifest entry for a source path like 'styles.css' or 'static/landing.html', if still current."""
+        entries = self._load()
+        entry = entries.get(key)
+        if entry is None or not self._is_fresh(key, entry):
+            return None
+        for dependency in entry.get("depends", ()):
+            if dependency not in entries or not self._is_fresh(dependency, entries[dependency]):
+                return None
+        return entry
+
+    def by_file(self, name: str) -> Optional[Dict]:
+        """Manifest entry for a hashed file name; hashed files never go stale."""
+        self._load()
+        return self._files.get(name)
+
+    def variant(self, entry: Dict, accept_encoding: Optional[str]) -> Tuple[Path, Optional[str]]:
+        """Path of the best encoded copy of entry for the client, and its Content-Encoding."""
+        encoding = choose_encoding(accept_encoding, entry.get("encodings", ()))
+        return self.out_dir / (entry["file"] + ENCODING_SUFFIXES.get(encoding, '')), encoding
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build precompressed, content-hashed static assets')
+    parser.add_argument('--out', default=str(ASSET_DIR), help='Output directory for hashed assets')
+    parser.add_argument('files', nargs='*', help='Source files (default: root assets and static/)')
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("⚠️ brotli not installed: building gzip variants only (pip install brotli)")
+    built = build_assets([Path(f) for f in args.files] or None, Path(args.out))
+    print(f"✅ {len(built)} assets written to {args.out}")
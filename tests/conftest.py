@@ -0,0 +1,81 @@
+"""Shared fixtures: a small workflows tree indexed into a throwaway database."""
+
+import builtins
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from workflow_db import WorkflowDatabase
+
+SAMPLE_WORKFLOWS = {
+    "0001_Slack_Send_Webhook.json": ["n8n-nodes-base.webhook", "n8n-nodes-base.slack"],
+    "0002_Telegram_Send_Scheduled.json": ["n8n-nodes-base.scheduleTrigger", "n8n-nodes-base.telegram"],
+    "0003_Slack_Telegram_Sync_Webhook.json": ["n8n-nodes-base.webhook", "n8n-nodes-base.slack",
+                                              "n8n-nodes-base.telegram"],
+    "0004_Manual_Gmail_Create_Triggered.json": ["n8n-nodes-base.manualTrigger", "n8n-nodes-base.gmail"],
+    "0005_Http_Notion_Update_Scheduled.json": ["n8n-nodes-base.scheduleTrigger", "n8n-nodes-base.httpRequest",
+                                               "n8n-nodes-base.notion"],
+}
+
+
+def write_workflow(directory: Path, filename: str, node_types, **fields) -> Path:
+    """Write a minimal n8n workflow file with one node per type."""
+    data = {
+        "id": filename.split("_")[0],
+        "name": filename[:-len(".json")].replace("_", " "),
+        "active": fields.pop("active", False),
+        "nodes": [{"type": node_type, "name": f"Node {i}", "parameters": {}}
+                  for i, node_type in enumerate(node_types)],
+        "connections": {},
+        **fields
+    }
+    path = directory / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def workflows_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "workflows"
+    for filename, node_types in SAMPLE_WORKFLOWS.items():
+        write_workflow(directory, filename, node_types)
+    return directory
+
+
+@pytest.fixture
+def db(tmp_path: Path, workflows_dir: Path):
+    database = WorkflowDatabase(str(tmp_path / "workflows.db"))
+    database.workflows_dir = str(workflows_dir)
+    database.categories_file = str(tmp_path / "search_categories.json")
+    database.index_all_workflows()
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope="session")
+def api_server(tmp_path_factory):
+    """api_server imported once, its module-level database in a throwaway directory."""
+    # The launcher provides the dual_get/dual_post route decorators api_server uses
+    def route(method):
+        return lambda path, **kwargs: getattr(sys.modules["api_server"].app, method)(path, **kwargs)
+    for name, method in (("dual_get", "get"), ("dual_post", "post")):
+        if not hasattr(builtins, name):
+            setattr(builtins, name, route(method))
+    os.environ["WORKFLOW_DB_PATH"] = str(tmp_path_factory.mktemp("api") / "workflows.db")
+    import api_server
+    return api_server
+
+
+@pytest.fixture
+def client(api_server, db, monkeypatch):
+    """A TestClient serving the db fixture's index."""
+    from fastapi.testclient import TestClient
+    monkeypatch.setattr(api_server, "db", db)
+    api_server._encoded_json.clear()
+    return TestClient(api_server.app)
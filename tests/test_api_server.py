@@ -0,0 +1,173 @@
+"""HTTP behaviour of api_server: validators, encodings and streamed downloads."""
+
+import functools
+import gzip
+import io
+import json
+import os
+import zipfile
+
+from conftest import SAMPLE_WORKFLOWS, write_workflow
+
+
+def test_zip_download_is_not_gzipped_again(client):
+    response = client.get("/api/workflows/download.zip", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert sorted(archive.namelist()) == sorted(SAMPLE_WORKFLOWS)
+
+
+def test_precompressed_json_is_encoded_once(client, db, workflows_dir):
+    for i in range(60):
+        write_workflow(workflows_dir, f"{100 + i}_Service{i}_Sync_Webhook.json",
+                       ["n8n-nodes-base.webhook", f"n8n-nodes-base.someLongServiceName{i}"])
+    db.index_all_workflows()
+
+    identity = client.get("/api/integrations", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    with client.stream("GET", "/api/integrations", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == identity.content
+
+
+def test_search_revalidates_until_the_index_changes(client, db, workflows_dir):
+    response = client.get("/api/workflows?q=slack")
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    assert client.get("/api/workflows?q=slack", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/workflows?q=slack", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get("/api/workflows?q=slack", headers={"If-Modified-Since": last_modified}).status_code == 304
+    # If-None-Match wins over If-Modified-Since
+    assert client.get("/api/workflows?q=slack", headers={"If-None-Match": '"other"',
+                                                         "If-Modified-Since": last_modified}).status_code == 200
+
+    write_workflow(workflows_dir, "0006_Slack_Alert_Webhook.json", ["n8n-nodes-base.webhook", "n8n-nodes-base.slack"])
+    db.index_all_workflows()
+    response = client.get("/api/workflows?q=slack", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["total"] == 3
+
+
+def test_workflow_detail_and_download_revalidate_on_file_content(client, workflows_dir):
+    filename = "0001_Slack_Send_Webhook.json"
+    for path in (f"/api/workflows/{filename}", f"/api/workflows/{filename}/download",
+                 f"/api/workflows/{filename}/diagram"):
+        response = client.get(path)
+        assert response.status_code == 200, path
+        etag = response.headers["etag"]
+        not_modified = client.get(path, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304, path
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+
+def test_moved_workflow_is_served_from_its_new_path(client, db, workflows_dir):
+    filename = "0001_Slack_Send_Webhook.json"
+    assert client.get(f"/api/workflows/{filename}/download").status_code == 200
+    (workflows_dir / "slack").mkdir()
+    os.replace(workflows_dir / filename, workflows_dir / "slack" / filename)
+    db.index_all_workflows()
+    for path in (f"/api/workflows/{filename}", f"/api/workflows/{filename}/download",
+                 f"/api/workflows/{filename}/diagram"):
+        assert client.get(path).status_code == 200, path
+
+
+def test_ndjson_export_streams_every_match_in_id_order(client, db, monkeypatch, workflows_dir):
+    # Several batches, so the export spans more than one keyset query
+    for i in range(12):
+        write_workflow(workflows_dir, f"{100 + i}_Slack_Post_Webhook.json",
+                       ["n8n-nodes-base.webhook", "n8n-nodes-base.slack"])
+    db.index_all_workflows()
+    monkeypatch.setattr(db, "iter_workflows", functools.partial(db.iter_workflows, batch_size=5))
+
+    response = client.get("/api/export.ndjson?q=slack")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert {row["filename"] for row in rows} == {
+        workflow["filename"] for workflow in db.search_workflows(query="slack", limit=100)[0]}
+    assert len(rows) == 14
+
+    everything = client.get("/api/export.ndjson").text.splitlines()
+    assert len(everything) == len(SAMPLE_WORKFLOWS) + 12
+
+
+def test_batch_keeps_request_order_and_lists_missing(client, workflows_dir):
+    os.remove(workflows_dir / "0002_Telegram_Send_Scheduled.json")
+    requested = ["0003_Slack_Telegram_Sync_Webhook.json", "missing.json", "0001_Slack_Send_Webhook.json",
+                 "0002_Telegram_Send_Scheduled.json", "0003_Slack_Telegram_Sync_Webhook.json"]
+
+    body = client.post("/api/workflows/batch", json={"filenames": requested}).json()
+    assert [entry["metadata"]["filename"] for entry in body["workflows"]] == [
+        "0003_Slack_Telegram_Sync_Webhook.json", "0001_Slack_Send_Webhook.json", "0002_Telegram_Send_Scheduled.json"]
+    assert body["missing"] == ["missing.json"]
+
+    body = client.post("/api/workflows/batch", json={"filenames": requested, "include_raw": True}).json()
+    assert [entry["raw_json"]["name"] for entry in body["workflows"]] == [
+        "0003 Slack Telegram Sync Webhook", "0001 Slack Send Webhook"]
+    assert body["missing"] == ["missing.json", "0002_Telegram_Send_Scheduled.json"]
+
+
+def test_indexer_columns_are_not_served(client):
+    filename = "0001_Slack_Send_Webhook.json"
+    rows = [client.get(f"/api/workflows/{filename}").json()["metadata"],
+            client.post("/api/workflows/batch", json={"filenames": [filename]}).json()["workflows"][0]["metadata"],
+            *(json.loads(line) for line in client.get("/api/export.ndjson").text.splitlines())]
+    for row in rows:
+        assert row["file_hash"]
+        assert not {"hash_algorithm", "file_mtime", "file_inode"} & row.keys()
+
+
+def test_zip_download_of_a_search_or_a_selection(client, workflows_dir):
+    response = client.get("/api/workflows/download.zip?q=telegram")
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert sorted(archive.namelist()) == ["0002_Telegram_Send_Scheduled.json",
+                                              "0003_Slack_Telegram_Sync_Webhook.json"]
+        name = "0002_Telegram_Send_Scheduled.json"
+        assert archive.read(name) == (workflows_dir / name).read_bytes()
+
+    response = client.get("/api/workflows/download.zip?filename=0005_Http_Notion_Update_Scheduled.json"
+                          "&filename=missing.json")
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == ["0005_Http_Notion_Update_Scheduled.json"]
+
+
+def test_detail_revalidates_when_only_its_metadata_changes(client, db, workflows_dir):
+    filename = "0001_Slack_Send_Webhook.json"
+    detail = client.get(f"/api/workflows/{filename}").headers["etag"]
+    download = client.get(f"/api/workflows/{filename}/download").headers["etag"]
+
+    with open(db.categories_file, "w", encoding="utf-8") as f:
+        json.dump([{"filename": filename, "category": "Communication"}], f)
+    db.refresh_categories()
+    response = client.get(f"/api/workflows/{filename}", headers={"If-None-Match": detail})
+    assert response.status_code == 200
+    assert response.json()["metadata"]["category"] == "Communication"
+    detail = response.headers["etag"]
+
+    (workflows_dir / "slack").mkdir()
+    os.replace(workflows_dir / filename, workflows_dir / "slack" / filename)
+    db.index_all_workflows()
+    response = client.get(f"/api/workflows/{filename}", headers={"If-None-Match": detail})
+    assert response.status_code == 200
+    assert response.json()["metadata"]["file_path"] == f"slack/{filename}"
+
+    # The file itself is unchanged
+    assert client.get(f"/api/workflows/{filename}/download", headers={"If-None-Match": download}).status_code == 304
+
+
+def test_zip_download_of_a_selection_posted_as_json(client, api_server, monkeypatch):
+    monkeypatch.setattr(api_server, "BATCH_MAX_WORKFLOWS", 2)
+    selection = sorted(SAMPLE_WORKFLOWS) + ["missing.json", sorted(SAMPLE_WORKFLOWS)[0]]
+    response = client.post("/api/workflows/download.zip", json={"filenames": selection},
+                           headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == sorted(SAMPLE_WORKFLOWS)
+
+    assert client.post("/api/workflows/download.zip", json={"filenames": []}).status_code == 422
@@ -0,0 +1,25 @@
+"""Content negotiation for precompressed variants."""
+
+import gzip
+
+from static_assets import MIN_COMPRESS_SIZE, choose_encoding, compress_variants
+
+
+def test_choose_encoding_prefers_brotli_then_gzip():
+    assert choose_encoding("gzip, deflate, br", {"br", "gzip"}) == "br"
+    assert choose_encoding("gzip, deflate, br", {"gzip"}) == "gzip"
+    assert choose_encoding("br;q=0.5, gzip", {"br", "gzip"}) == "gzip"
+
+
+def test_choose_encoding_falls_back_to_identity():
+    assert choose_encoding(None, {"br", "gzip"}) is None
+    assert choose_encoding("identity", {"br", "gzip"}) is None
+    assert choose_encoding("gzip;q=0, br;q=bogus", {"br", "gzip"}) is None
+    assert choose_encoding("*", {"gzip"}) == "gzip"
+    assert choose_encoding("*, gzip;q=0", {"gzip"}) is None
+
+
+def test_compress_variants_skips_small_bodies():
+    assert compress_variants(b"x" * (MIN_COMPRESS_SIZE - 1)) == {}
+    body = b'{"name": "workflow"}' * 100
+    assert gzip.decompress(compress_variants(body)["gzip"]) == body
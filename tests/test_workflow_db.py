@@ -0,0 +1,206 @@
+"""WorkflowDatabase indexing, lookups and pagination."""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from conftest import SAMPLE_WORKFLOWS, write_workflow
+from workflow_db import WorkflowDatabase
+
+
+def test_moved_file_is_found_after_reindex(db, workflows_dir):
+    filename = "0001_Slack_Send_Webhook.json"
+    assert db.get_workflow(filename) is not None  # cache the row
+
+    target = workflows_dir / "moved" / filename
+    target.parent.mkdir()
+    os.replace(workflows_dir / filename, target)
+    stats = db.index_all_workflows()
+
+    assert stats['processed'] == 0
+    assert db.workflow_file_path(db.get_workflow(filename)) == str(target)
+    assert db.get_workflow_path(filename) == str(target)
+
+
+def test_reindex_without_changes_skips_everything(db):
+    generation = db.get_generation()
+    stats = db.index_all_workflows()
+    assert stats['processed'] == 0
+    assert stats['skipped'] == len(SAMPLE_WORKFLOWS)
+    assert db.get_generation() == generation
+
+
+def write_categories(db, mapping):
+    with open(db.categories_file, 'w', encoding='utf-8') as f:
+        json.dump([{"filename": name, "category": category} for name, category in mapping.items()], f)
+
+
+def test_version_lookup_does_not_import_categories(db):
+    write_categories(db, {"0001_Slack_Send_Webhook.json": "Communication"})
+    generation = db.get_generation()
+    assert db.get_workflow("0001_Slack_Send_Webhook.json")['category'] == "Uncategorized"
+
+    assert db.refresh_categories()
+    assert db.get_generation() == generation + 1
+    assert db.get_workflow("0001_Slack_Send_Webhook.json")['category'] == "Communication"
+
+
+def test_failed_category_import_warns_instead_of_raising(db, monkeypatch, capsys):
+    write_categories(db, {"0001_Slack_Send_Webhook.json": "Communication"})
+    connect = db._connect
+
+    def read_only_connection(read_only: bool = False):
+        conn = connect(read_only)
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    monkeypatch.setattr(db, "_connect", read_only_connection)
+    assert db.refresh_categories() is False
+    assert "Could not store categories" in capsys.readouterr().out
+
+
+def test_opening_an_existing_database_does_not_write(db):
+    writer = sqlite3.connect(db.db_path)
+    writer.execute("BEGIN IMMEDIATE")  # hold the write lock, as an index run would
+    try:
+        reopened = WorkflowDatabase(db.db_path)
+        reopened.close()
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_facets_count_every_match(db):
+    facets = db.get_search_facets()
+    assert facets["trigger_type"] == {"Webhook": 2, "Scheduled": 2, "Manual": 1}
+    assert facets["active"] == {"true": 0, "false": 5}
+
+    facets = db.get_search_facets(query="slack")
+    assert facets["trigger_type"] == {"Webhook": 2}
+    assert {"name": "Slack", "count": 2} in facets["integrations"]
+
+
+def test_outdated_facets_are_served_while_rebuilding(db, tmp_path, workflows_dir):
+    assert db.get_search_facets()["active"]["false"] == 5
+
+    # Another process indexes a new workflow; this one only sees the generation change
+    write_workflow(workflows_dir, "0006_Slack_Alert_Webhook.json", ["n8n-nodes-base.webhook", "n8n-nodes-base.slack"])
+    other = WorkflowDatabase(db.db_path)
+    other.workflows_dir = db.workflows_dir
+    other.categories_file = db.categories_file
+    other.index_all_workflows()
+    other.close()
+
+    assert db.get_search_facets()["active"]["false"] == 5
+    db._facet_refresh.result(timeout=10)
+    assert db.get_search_facets()["active"]["false"] == 6
+
+
+def test_parallel_reindex_matches_serial(db):
+    columns = "filename, name, trigger_type, complexity, integrations, description, file_hash"
+    with sqlite3.connect(db.db_path) as conn:
+        serial = conn.execute(f"SELECT {columns} FROM workflows ORDER BY filename").fetchall()
+
+    stats = db.index_all_workflows(force_reindex=True, jobs=2)
+    assert stats["processed"] == len(SAMPLE_WORKFLOWS)
+    assert stats["scanned_per_sec"] >= stats["files_per_sec"] > 0
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute(f"SELECT {columns} FROM workflows ORDER BY filename").fetchall() == serial
+
+
+def page_through(db, limit, **search):
+    """Every page of a search, following next_cursor() from the first page."""
+    pages, cursor, page = [], None, 1
+    while True:
+        results, total = db.search_workflows(limit=limit, cursor=cursor, **search)
+        pages.append([workflow["filename"] for workflow in results])
+        cursor = db.next_cursor(results, page, limit, total, **search)
+        if cursor is None:
+            return pages
+        page += 1
+
+
+def test_cursor_pages_match_offset_pages(db):
+    for search in ({}, {"query": "slack"}, {"query": "send"}, {"trigger_filter": "Webhook"}):
+        total = db.search_workflows(limit=100, **search)[1]
+        for limit in (1, 2):
+            offset_pages = [
+                [workflow["filename"] for workflow in db.search_workflows(limit=limit, offset=offset, **search)[0]]
+                for offset in range(0, total, limit)
+            ]
+            assert page_through(db, limit, **search) == offset_pages, (search, limit)
+            filenames = sum(offset_pages, [])
+            assert len(set(filenames)) == len(filenames) == total > 1
+
+
+def test_cursor_of_another_search_is_rejected(db):
+    results, total = db.search_workflows(limit=2)
+    cursor = db.next_cursor(results, 1, 2, total)
+    with pytest.raises(ValueError):
+        db.search_workflows(limit=2, cursor=cursor, query="slack")
+    with pytest.raises(ValueError):
+        db.search_workflows(limit=2, cursor="not a cursor")
+
+
+def test_category_cursor_pages_match_offset_pages(db):
+    total = db.search_by_category("messaging", limit=100)[1]
+    assert total > 1
+    offset_pages = [[workflow["filename"] for workflow in db.search_by_category("messaging", limit=1, offset=offset)[0]]
+                    for offset in range(total)]
+    cursor_pages, cursor = [], None
+    for page in range(1, total + 1):
+        results, _ = db.search_by_category("messaging", limit=1, cursor=cursor)
+        cursor_pages.append([workflow["filename"] for workflow in results])
+        cursor = db.next_cursor(results, page, 1, total, category="messaging")
+    assert cursor is None
+    assert cursor_pages == offset_pages
+
+
+def derived_state(db):
+    """Everything the sync triggers maintain, keyed by filename rather than row id."""
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES ('integrity-check')")
+        matches = {
+            term: sorted(row[0] for row in conn.execute(
+                "SELECT w.filename FROM workflows_fts JOIN workflows w ON w.id = workflows_fts.rowid "
+                "WHERE workflows_fts MATCH ?", (term,)))
+            for term in ("slack", "telegram", "notion", "alert", "webhook")
+        }
+        integrations = sorted(conn.execute(
+            "SELECT w.filename, i.integration FROM workflow_integrations i JOIN workflows w ON w.id = i.workflow_id"))
+        tags = sorted(conn.execute(
+            "SELECT w.filename, t.tag FROM workflow_tags t JOIN workflows w ON w.id = t.workflow_id"))
+        counts = sorted(conn.execute("SELECT integration, workflow_count FROM integration_counts"))
+    stats = db.get_stats()
+    stats.pop("last_indexed")
+    return {"matches": matches, "integrations": integrations, "tags": tags, "counts": counts, "stats": stats}
+
+
+def test_sync_triggers_match_a_bulk_rebuild(db, tmp_path, workflows_dir):
+    # Incremental: add, change and remove files so every trigger fires
+    write_workflow(workflows_dir, "0006_Slack_Alert_Webhook.json", ["n8n-nodes-base.webhook", "n8n-nodes-base.slack"],
+                   active=True, tags=[{"name": "alerts"}, {"name": "ops"}])
+    write_workflow(workflows_dir, "0002_Telegram_Send_Scheduled.json",
+                   ["n8n-nodes-base.scheduleTrigger", "n8n-nodes-base.notion"], tags=[{"name": "ops"}])
+    (workflows_dir / "0004_Manual_Gmail_Create_Triggered.json").unlink()
+    assert db.index_all_workflows(bulk=False)["processed"] == 2
+    incremental = derived_state(db)
+
+    assert incremental["stats"]["total"] == 5
+    assert incremental["stats"]["active"] == 1
+    assert incremental["matches"]["notion"] == ["0002_Telegram_Send_Scheduled.json",
+                                                "0005_Http_Notion_Update_Scheduled.json"]
+    assert ("0006_Slack_Alert_Webhook.json", "alerts") in incremental["tags"]
+    assert ("Gmail", 1) not in incremental["counts"]
+
+    db.index_all_workflows(force_reindex=True, bulk=True)
+    assert derived_state(db) == incremental
+
+    fresh = WorkflowDatabase(str(tmp_path / "fresh.db"))
+    fresh.workflows_dir = db.workflows_dir
+    fresh.categories_file = db.categories_file
+    fresh.index_all_workflows()
+    assert derived_state(fresh) == incremental
+    fresh.close()
@@ -0,0 +1,64 @@
+"""SimilarityIndex: incremental syncs must match a rebuild from scratch."""
+
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import write_workflow
+from workflow_similarity import SimilarityIndex
+
+
+def all_similar(index: SimilarityIndex, conn: sqlite3.Connection):
+    ids = [row[0] for row in conn.execute("SELECT id FROM workflows ORDER BY id")]
+    return {workflow_id: [(other, round(score, 5)) for other, score in index.similar(workflow_id, 10)]
+            for workflow_id in ids}
+
+
+def test_incremental_sync_matches_rebuild(db, tmp_path, workflows_dir):
+    db.get_similar_workflows("0001_Slack_Send_Webhook.json")
+
+    (workflows_dir / "0004_Manual_Gmail_Create_Triggered.json").unlink()
+    write_workflow(workflows_dir, "0002_Telegram_Send_Scheduled.json",
+                   ["n8n-nodes-base.scheduleTrigger", "n8n-nodes-base.telegram", "n8n-nodes-base.slack"])
+    write_workflow(workflows_dir, "0006_Notion_Slack_Sync_Webhook.json",
+                   ["n8n-nodes-base.webhook", "n8n-nodes-base.notion", "n8n-nodes-base.slack"])
+    db.index_all_workflows()
+
+    with sqlite3.connect(db.db_path) as conn:
+        generation = db.get_generation()
+        # The index run already applied its changes
+        assert db.similarity.generation == generation
+        assert not db.similarity.sync(conn, generation)
+        assert "integration:gmail" not in db.similarity._matrix.terms
+        rebuilt = SimilarityIndex(str(tmp_path / "rebuilt.similar.npz"))
+        assert rebuilt.sync(conn, generation)
+        assert len(rebuilt) == len(db.similarity) == 5
+        assert all_similar(db.similarity, conn) == all_similar(rebuilt, conn)
+
+        # The saved matrix loads back to the same index
+        reloaded = SimilarityIndex(db.similarity.path)
+        assert not reloaded.sync(conn, generation)
+        assert all_similar(reloaded, conn) == all_similar(rebuilt, conn)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_outdated_index_answers_while_it_refreshes(db):
+    expected = db.get_similar_workflows("0001_Slack_Send_Webhook.json")
+    built = db.similarity.generation
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE workflow_stats SET value = value + 1 WHERE key = 'generation'")
+    assert db.get_similar_workflows("0001_Slack_Send_Webhook.json") == expected
+
+    db._similarity_refresh.result()
+    assert db.similarity.generation == db.get_generation() == built + 1
+    assert db.get_similar_workflows("0001_Slack_Send_Webhook.json") == expected
+
+
+def test_similar_workflows_share_terms(db):
+    similar = db.get_similar_workflows("0001_Slack_Send_Webhook.json", k=3)
+    assert similar[0]["filename"] == "0003_Slack_Telegram_Sync_Webhook.json"
+    assert all(workflow["similarity"] > 0 for workflow in similar)
+    assert db.get_similar_workflows("missing.json") is None
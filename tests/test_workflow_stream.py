@@ -0,0 +1,59 @@
+"""The streaming extractor must agree with json.loads on every field it keeps."""
+
+import hashlib
+import io
+import json
+
+import pytest
+
+import workflow_stream
+from workflow_stream import NODE_FIELDS, TOP_LEVEL_FIELDS, extract_workflow_fields
+
+WORKFLOW = {
+    "name": "Tricky \"quoted\" name with {braces} and [brackets] \\ ünïcödé 🚀",
+    "id": 42,
+    "active": True,
+    "pinData": {"Node": [{"json": {"text": "x" * 70000, "nested": [[], {}, [{"a": "]}"}]]}}]},
+    "nodes": [
+        {"parameters": {"jsCode": "return [{json: {a: '}'}}];", "list": [1, 2.5e3, None, False]},
+         "type": "n8n-nodes-base.code", "name": "Code \\\"1\\\"", "position": [0, 0]},
+        {"type": "n8n-nodes-base.slack", "name": "Slack\nNotify", "typeVersion": 2},
+        {"name": "No type"},
+    ],
+    "connections": {"Code": {"main": [[{"node": "Slack", "type": "main", "index": 0}]]}},
+    "tags": [{"name": "alerts"}, "legacy"],
+    "createdAt": "2024-01-01T00:00:00.000Z",
+    "updatedAt": None,
+    "settings": {"executionOrder": "v1"},
+}
+
+
+def expected_fields(data):
+    expected = {key: value for key, value in data.items() if key in TOP_LEVEL_FIELDS}
+    expected["nodes"] = [{key: value for key, value in node.items() if key in NODE_FIELDS} for node in data["nodes"]]
+    return expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 64 * 1024])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_extractor_matches_json_loads(monkeypatch, chunk_size, indent):
+    monkeypatch.setattr(workflow_stream, "CHUNK_SIZE", chunk_size)
+    raw = json.dumps(WORKFLOW, indent=indent, ensure_ascii=False).encode("utf-8")
+    hasher = hashlib.blake2b()
+
+    data, size = extract_workflow_fields(io.BytesIO(raw), [hasher])
+
+    assert data == expected_fields(json.loads(raw))
+    assert size == len(raw)
+    assert hasher.hexdigest() == hashlib.blake2b(raw).hexdigest()
+
+
+def test_extractor_accepts_a_byte_order_mark():
+    raw = b"\xef\xbb\xbf" + json.dumps(WORKFLOW).encode("utf-8")
+    assert extract_workflow_fields(io.BytesIO(raw))[0] == expected_fields(WORKFLOW)
+
+
+@pytest.mark.parametrize("raw", [b"", b"[]", b'{"nodes": [', b'{"name": "x" "id": 1}', b'{"name": "x"} trailing'])
+def test_extractor_rejects_malformed_json(raw):
+    with pytest.raises(ValueError):
+        extract_workflow_fields(io.BytesIO(raw))
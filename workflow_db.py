@@ -7,107 +7,575 @@ SQLite-based workflow indexer and search engine for instant performance.
 import sqlite3
 import json
 import os
+import asyncio
+import base64
 import glob
+import heapq
 import datetime
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
-class WorkflowDatabase:
-    """High-performance SQLite database for workflow metadata and search."""
+from workflow_stream import extract_workflow_fields
+from workflow_similarity import SimilarityIndex
+
+try:
+    import xxhash
+except ImportError:  # optional: faster change-detection hashing
+    xxhash = None
+
+# Files at least this large are analyzed with the streaming extractor so peak
+# memory doesn't grow with embedded pinData or code blobs
+STREAMING_PARSE_THRESHOLD = 8 * 1024 * 1024
+
+# Per-connection tuning for pooled read connections
+READ_MMAP_SIZE = 256 * 1024 * 1024
+READ_CACHE_SIZE_KIB = 16 * 1024
+STATEMENT_CACHE_SIZE = 256
+
+# Number of analyzed rows handed to SQLite per executemany() call while indexing
+INDEX_BATCH_SIZE = 500
+
+# Reindexes at least this many files (or forced ones) load rows without the
+# FTS sync triggers and rebuild workflows_fts once at the end
+BULK_INDEX_THRESHOLD = 500
+
+# Result counts remembered per index generation, so paging through one search
+# runs its COUNT(*) once
+COUNT_CACHE_SIZE = 256
+
+# Default in-process search result cache limits (WORKFLOW_CACHE_SIZE and
+# WORKFLOW_CACHE_TTL override them; a size of 0 disables the cache)
+RESULT_CACHE_SIZE = 512
+RESULT_CACHE_TTL = 300.0
+
+# Threads (and so pooled read connections) serving the *_async methods;
+# WORKFLOW_DB_THREADS overrides it
+DB_EXECUTOR_THREADS = 8
+
+# Filename -> category list imported into workflow_categories; workflows it
+# doesn't list (or lists without a category) are in UNCATEGORIZED
+CATEGORIES_FILE = os.path.join("context", "search_categories.json")
+UNCATEGORIZED = "Uncategorized"
+
+# A workflow's category as stored in workflows.category; {} is its filename
+CATEGORY_OF_SQL = (f"COALESCE((SELECT category FROM workflow_categories WHERE filename = {{}}), "
+                   f"'{UNCATEGORIZED}')")
+
+# Change-detection bookkeeping of the indexer, left out of the metadata the API serves
+INDEXER_COLUMNS = ('hash_algorithm', 'file_mtime', 'file_inode')
+
+# UPSERT keeps the row id stable, so an update fires workflows_au once instead
+# of the delete + insert triggers that INSERT OR REPLACE caused
+INSERT_WORKFLOW_SQL = f"""
+    INSERT INTO workflows (
+        filename, name, workflow_id, active, description, trigger_type,
+        complexity, node_count, integrations, tags, created_at, updated_at,
+        file_hash, hash_algorithm, file_size, file_mtime, file_inode, node_types, file_path, analyzed_at, category
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP,
+              {CATEGORY_OF_SQL.format('?1')})
+    ON CONFLICT(filename) DO UPDATE SET
+        name = excluded.name,
+        workflow_id = excluded.workflow_id,
+        active = excluded.active,
+        description = excluded.description,
+        trigger_type = excluded.trigger_type,
+        complexity = excluded.complexity,
+        node_count = excluded.node_count,
+        integrations = excluded.integrations,
+        tags = excluded.tags,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        file_hash = excluded.file_hash,
+        hash_algorithm = excluded.hash_algorithm,
+        file_size = excluded.file_size,
+        file_mtime = excluded.file_mtime,
+        file_inode = excluded.file_inode,
+        node_types = excluded.node_types,
+        file_path = excluded.file_path,
+        analyzed_at = excluded.analyzed_at
+"""
+
+# Refreshes the stored hash, stat signature and location of a file whose content is unchanged
+UPDATE_FILE_STAT_SQL = """
+    UPDATE workflows
+    SET file_hash = ?, hash_algorithm = ?, file_size = ?, file_mtime = ?, file_inode = ?, file_path = ?
+    WHERE filename = ?
+"""
+
+# Triggers that keep workflows_fts in sync with workflows, by name. The update
+# trigger only fires when an indexed column changes, not on hash/stat refreshes.
+FTS_SYNC_TRIGGERS = {
+    'workflows_ai': """
+        CREATE TRIGGER workflows_ai AFTER INSERT ON workflows BEGIN
+            INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
+            VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
+        END
+    """,
+    'workflows_ad': """
+        CREATE TRIGGER workflows_ad AFTER DELETE ON workflows BEGIN
+            INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
+            VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
+        END
+    """,
+    'workflows_au': """
+        CREATE TRIGGER workflows_au
+        AFTER UPDATE OF filename, name, description, integrations, tags ON workflows BEGIN
+            INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
+            VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
+            INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
+            VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
+        END
+    """,
+}
+
+# Tag name as the API shows it: dict tags contribute their name (or id)
+_TAG_NAME_SQL = """
+    CASE type WHEN 'object'
+        THEN COALESCE(json_extract(value, '$.name'), CAST(json_extract(value, '$.id') AS TEXT), 'tag')
+        ELSE CAST(value AS TEXT)
+    END
+"""
+
+# Triggers that keep workflow_integrations and workflow_tags in step with the
+# JSON columns of workflows, whichever code path writes them
+FACET_SYNC_TRIGGERS = {
+    'workflows_facets_ai': f"""
+        CREATE TRIGGER workflows_facets_ai AFTER INSERT ON workflows BEGIN
+            INSERT OR IGNORE INTO workflow_integrations(workflow_id, integration)
+            SELECT new.id, value FROM json_each(new.integrations);
+            INSERT OR IGNORE INTO workflow_tags(workflow_id, tag)
+            SELECT new.id, {_TAG_NAME_SQL} FROM json_each(new.tags);
+        END
+    """,
+    'workflows_facets_ad': """
+        CREATE TRIGGER workflows_facets_ad AFTER DELETE ON workflows BEGIN
+            DELETE FROM workflow_integrations WHERE workflow_id = old.id;
+            DELETE FROM workflow_tags WHERE workflow_id = old.id;
+        END
+    """,
+    'workflows_facets_au': f"""
+        CREATE TRIGGER workflows_facets_au AFTER UPDATE OF integrations, tags ON workflows BEGIN
+            DELETE FROM workflow_integrations WHERE workflow_id = old.id;
+            DELETE FROM workflow_tags WHERE workflow_id = old.id;
+            INSERT OR IGNORE INTO workflow_integrations(workflow_id, integration)
+            SELECT new.id, value FROM json_each(new.integrations);
+            INSERT OR IGNORE INTO workflow_tags(workflow_id, tag)
+            SELECT new.id, {_TAG_NAME_SQL} FROM json_each(new.tags);
+        END
+    """,
+}
+
+# Counter deltas a workflows row contributes to workflow_stats; {sign} is
+# '' or '-' and {row} is 'new' or 'old'
+_STATS_DELTAS_SQL = """
+    ('active', {sign}(CASE WHEN {row}.active THEN 1 ELSE 0 END)),
+    ('total_nodes', {sign}COALESCE({row}.node_count, 0)),
+    ('trigger:' || COALESCE({row}.trigger_type, ''), {sign}1),
+    ('complexity:' || COALESCE({row}.complexity, ''), {sign}1)
+"""
+_UPSERT_STATS_SQL = "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value"
+
+# Triggers that keep workflow_stats and integration_counts current as rows are
+# inserted, updated or deleted, so get_stats never aggregates the table
+STATS_SYNC_TRIGGERS = {
+    'workflows_stats_ai': f"""
+        CREATE TRIGGER workflows_stats_ai AFTER INSERT ON workflows BEGIN
+            INSERT INTO workflow_stats(key, value) VALUES
+                ('total', 1), {_STATS_DELTAS_SQL.format(sign='', row='new')}
+            {_UPSERT_STATS_SQL};
+        END
+    """,
+    'workflows_stats_ad': f"""
+        CREATE TRIGGER workflows_stats_ad AFTER DELETE ON workflows BEGIN
+            INSERT INTO workflow_stats(key, value) VALUES
+                ('total', -1), {_STATS_DELTAS_SQL.format(sign='-', row='old')}
+            {_UPSERT_STATS_SQL};
+        END
+    """,
+    'workflows_stats_au': f"""
+        CREATE TRIGGER workflows_stats_au
+        AFTER UPDATE OF active, node_count, trigger_type, complexity ON workflows BEGIN
+            INSERT INTO workflow_stats(key, value) VALUES
+                {_STATS_DELTAS_SQL.format(sign='-', row='old')},
+                {_STATS_DELTAS_SQL.format(sign='', row='new')}
+            {_UPSERT_STATS_SQL};
+        END
+    """,
+    'workflow_integrations_stats_ai': f"""
+        CREATE TRIGGER workflow_integrations_stats_ai AFTER INSERT ON workflow_integrations BEGIN
+            INSERT INTO workflow_stats(key, value)
+            SELECT 'unique_integrations', 1
+            WHERE NOT EXISTS (SELECT 1 FROM integration_counts WHERE integration = new.integration)
+            {_UPSERT_STATS_SQL};
+            INSERT INTO integration_counts(integration, workflow_count) VALUES (new.integration, 1)
+            ON CONFLICT(integration) DO UPDATE SET workflow_count = workflow_count + 1;
+        END
+    """,
+    'workflow_integrations_stats_ad': """
+        CREATE TRIGGER workflow_integrations_stats_ad AFTER DELETE ON workflow_integrations BEGIN
+            UPDATE integration_counts SET workflow_count = workflow_count - 1
+            WHERE integration = old.integration;
+            DELETE FROM integration_counts
+            WHERE integration = old.integration AND workflow_count <= 0;
+            UPDATE workflow_stats SET value = value - 1
+            WHERE key = 'unique_integrations'
+              AND NOT EXISTS (SELECT 1 FROM integration_counts WHERE integration = old.integration);
+        END
+    """,
+}
+
+# Every trigger that mirrors workflows into derived tables; bulk loads drop
+# them all and rebuild the derived tables in one pass instead
+SYNC_TRIGGERS = {**FTS_SYNC_TRIGGERS, **FACET_SYNC_TRIGGERS, **STATS_SYNC_TRIGGERS}
+
+# Digest used for rows indexed before hash_algorithm was recorded
+LEGACY_HASH_ALGORITHM = 'md5'
+
+HASH_ALGORITHMS = ('xxh3_64', 'xxh64', 'blake2b', 'md5')
+DEFAULT_HASH_ALGORITHM = 'xxh3_64' if xxhash is not None else 'blake2b'
+
+
+# Enhanced service mapping for better recognition (node type/name -> integration)
+SERVICE_MAPPINGS = {
+    # Messaging & Communication
+    'telegram': 'Telegram',
+    'telegramTrigger': 'Telegram',
+    'discord': 'Discord',
+    'slack': 'Slack', 
+    'whatsapp': 'WhatsApp',
+    'mattermost': 'Mattermost',
+    'teams': 'Microsoft Teams',
+    'rocketchat': 'Rocket.Chat',
+
+    # Email
+    'gmail': 'Gmail',
+    'mailjet': 'Mailjet',
+    'emailreadimap': 'Email (IMAP)',
+    'emailsendsmt': 'Email (SMTP)',
+    'outlook': 'Outlook',
+
+    # Cloud Storage
+    'googledrive': 'Google Drive',
+    'googledocs': 'Google Docs',
+    'googlesheets': 'Google Sheets',
+    'dropbox': 'Dropbox',
+    'onedrive': 'OneDrive',
+    'box': 'Box',
+
+    # Databases
+    'postgres': 'PostgreSQL',
+    'mysql': 'MySQL',
+    'mongodb': 'MongoDB',
+    'redis': 'Redis',
+    'airtable': 'Airtable',
+    'notion': 'Notion',
+
+    # Project Management
+    'jira': 'Jira',
+    'github': 'GitHub',
+    'gitlab': 'GitLab',
+    'trello': 'Trello',
+    'asana': 'Asana',
+    'mondaycom': 'Monday.com',
+
+    # AI/ML Services
+    'openai': 'OpenAI',
+    'anthropic': 'Anthropic',
+    'huggingface': 'Hugging Face',
+
+    # Social Media
+    'linkedin': 'LinkedIn',
+    'twitter': 'Twitter/X',
+    'facebook': 'Facebook',
+    'instagram': 'Instagram',
+
+    # E-commerce
+    'shopify': 'Shopify',
+    'stripe': 'Stripe',
+    'paypal': 'PayPal',
+
+    # Analytics
+    'googleanalytics': 'Google Analytics',
+    'mixpanel': 'Mixpanel',
+
+    # Calendar & Tasks
+    'googlecalendar': 'Google Calendar', 
+    'googletasks': 'Google Tasks',
+    'cal': 'Cal.com',
+    'calendly': 'Calendly',
+
+    # Forms & Surveys
+    'typeform': 'Typeform',
+    'googleforms': 'Google Forms',
+    'form': 'Form Trigger',
+
+    # Development Tools
+    'webhook': 'Webhook',
+    'httpRequest': 'HTTP Request',
+    'graphql': 'GraphQL',
+    'sse': 'Server-Sent Events',
+
+    # Utility nodes (exclude from integrations)
+    'set': None,
+    'function': None,
+    'code': None,
+    'if': None,
+    'switch': None,
+    'merge': None,
+    'split': None,
+    'stickynote': None,
+    'stickyNote': None,
+    'wait': None,
+    'schedule': None,
+    'cron': None,
+    'manual': None,
+    'stopanderror': None,
+    'noop': None,
+    'noOp': None,
+    'error': None,
+    'limit': None,
+    'aggregate': None,
+    'summarize': None,
+    'filter': None,
+    'sort': None,
+    'removeDuplicates': None,
+    'dateTime': None,
+    'extractFromFile': None,
+    'convertToFile': None,
+    'readBinaryFile': None,
+    'readBinaryFiles': None,
+    'executionData': None,
+    'executeWorkflow': None,
+    'executeCommand': None,
+    'respondToWebhook': None,
+}
+
+# Mapping keys that can appear in a lowercased node name, in priority order.
+# Keys with uppercase letters never match and utility keys map to None.
+_NAME_HINT_KEYS = [key for key, value in SERVICE_MAPPINGS.items() if value and key == key.lower()]
+_NAME_HINT_PRIORITY = {key: i for i, key in enumerate(_NAME_HINT_KEYS)}
+
+# One pass finds every key occurrence: the lookahead allows overlapping
+# matches, and at each position the alternation yields the highest-priority key
+_NAME_HINT_PATTERN = re.compile('(?=(' + '|'.join(map(re.escape, _NAME_HINT_KEYS)) + '))')
+
+
+def match_name_hint(node_name: str) -> Optional[str]:
+    """First SERVICE_MAPPINGS integration named in a lowercased node name, or None."""
+    best = None
+    for match in _NAME_HINT_PATTERN.finditer(node_name):
+        priority = _NAME_HINT_PRIORITY[match.group(1)]
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break
+    return SERVICE_MAPPINGS[_NAME_HINT_KEYS[best]] if best is not None else None
+
+
+@lru_cache(maxsize=8192)
+def classify_node(node_type: str, node_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Memoized (trigger_hint, service_name) of a node; trigger_hint is 'webhook', 'scheduled', 'trigger' or None."""
+    node_type_lower = node_type.lower()
     
-    def __init__(self, db_path: str = None):
-        # Use environment variable if no path provided
-        if db_path is None:
-            db_path = os.environ.get('WORKFLOW_DB_PATH', 'workflows.db')
-        self.db_path = db_path
-        self.workflows_dir = "workflows"
-        self.init_database()
+    trigger_hint = None
+    if 'webhook' in node_type_lower or 'webhook' in node_name:
+        trigger_hint = 'webhook'
+    elif 'cron' in node_type_lower or 'schedule' in node_type_lower:
+        trigger_hint = 'scheduled'
+    elif 'trigger' in node_type_lower and 'manual' not in node_type_lower:
+        trigger_hint = 'trigger'
     
-    def init_database(self):
-        """Initialize SQLite database with optimized schema and indexes."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA journal_mode=WAL")  # Write-ahead logging for performance
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=MEMORY")
-        
-        # Create main workflows table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS workflows (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                filename TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                workflow_id TEXT,
-                active BOOLEAN DEFAULT 0,
-                description TEXT,
-                trigger_type TEXT,
-                complexity TEXT,
-                node_count INTEGER DEFAULT 0,
-                integrations TEXT,  -- JSON array
-                tags TEXT,         -- JSON array
-                created_at TEXT,
-                updated_at TEXT,
-                file_hash TEXT,
-                file_size INTEGER,
-                analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Create FTS5 table for full-text search
-        conn.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS workflows_fts USING fts5(
-                filename,
-                name,
-                description,
-                integrations,
-                tags,
-                content=workflows,
-                content_rowid=id
-            )
-        """)
-        
-        # Create indexes for fast filtering
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_trigger_type ON workflows(trigger_type)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_complexity ON workflows(complexity)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_active ON workflows(active)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_node_count ON workflows(node_count)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_filename ON workflows(filename)")
-        
-        # Create triggers to keep FTS table in sync
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS workflows_ai AFTER INSERT ON workflows BEGIN
-                INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
-                VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
-            END
-        """)
-        
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS workflows_ad AFTER DELETE ON workflows BEGIN
-                INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
-                VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
-            END
-        """)
-        
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS workflows_au AFTER UPDATE ON workflows BEGIN
-                INSERT INTO workflows_fts(workflows_fts, rowid, filename, name, description, integrations, tags)
-                VALUES ('delete', old.id, old.filename, old.name, old.description, old.integrations, old.tags);
-                INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
-                VALUES (new.id, new.filename, new.name, new.description, new.integrations, new.tags);
-            END
+    # Extract integrations with enhanced mapping
+    service_name = None
+    
+    # Handle n8n-nodes-base nodes
+    if node_type.startswith('n8n-nodes-base.'):
+        raw_service = node_type.replace('n8n-nodes-base.', '').lower()
+        raw_service = raw_service.replace('trigger', '')
+        service_name = SERVICE_MAPPINGS.get(raw_service, raw_service.title() if raw_service else None)
+    
+    # Handle @n8n/ namespaced nodes
+    elif node_type.startswith('@n8n/'):
+        raw_service = node_type.split('.')[-1].lower() if '.' in node_type else node_type_lower
+        raw_service = raw_service.replace('trigger', '')
+        service_name = SERVICE_MAPPINGS.get(raw_service, raw_service.title() if raw_service else None)
+    
+    # Handle custom nodes
+    elif '-' in node_type:
+        # Try to extract service name from custom node names like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
+        for part in node_type_lower.split('.'):
+            if 'youtube' in part:
+                service_name = 'YouTube'
+                break
+            elif 'telegram' in part:
+                service_name = 'Telegram'
+                break
+            elif 'discord' in part:
+                service_name = 'Discord'
+                break
+    
+    # Also check node names for service hints
+    name_hint = match_name_hint(node_name)
+    if name_hint:
+        service_name = name_hint
+    
+    if service_name in ('None', None):
+        service_name = None
+    return trigger_hint, service_name
+
+
+def new_hasher(algorithm: str):
+    """Incremental hashlib-style hasher for the named change-detection algorithm."""
+    if algorithm.startswith('xxh') and xxhash is None:
+        raise ValueError(f"Hash algorithm '{algorithm}' requires the xxhash package")
+    if algorithm == 'xxh3_64':
+        return xxhash.xxh3_64()
+    if algorithm == 'xxh64':
+        return xxhash.xxh64()
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(digest_size=16)
+    if algorithm == 'md5':
+        return hashlib.md5()
+    raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
+
+def hash_available(algorithm: str) -> bool:
+    """Whether digests with the named algorithm can be computed in this environment."""
+    try:
+        new_hasher(algorithm)
+    except ValueError:
+        return False
+    return True
+
+
+def hash_content(data: bytes, algorithm: str) -> str:
+    """Hex digest of a file's bytes with the named change-detection algorithm."""
+    hasher = new_hasher(algorithm)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+class _ResultCache:
+    """Thread-safe LRU cache with an optional TTL and hit/miss/eviction counters; values are shared, so read-only."""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Any, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+    
+    def put(self, key: Any, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry, counting them as invalidated."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+
+# Sentinel for cache lookups, since None and empty results are cacheable
+_MISSING = object()
+
+
+def _bitmap(ids: Iterable[int]) -> int:
+    """Workflow ids as an int with bit id set for each."""
+    bits = bytearray()
+    for workflow_id in ids:
+        index = workflow_id >> 3
+        if index >= len(bits):
+            bits.extend(bytes(index + 1 - len(bits)))
+        bits[index] |= 1 << (workflow_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class _FacetBitmaps:
+    """One bitmap of workflow ids per facet value, so a count within a search is one AND and bit_count()."""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        values: Dict[Tuple[str, Any], List[int]] = {}
+        rows = conn.execute("""
+            SELECT id, trigger_type, complexity, CASE WHEN active THEN 'true' ELSE 'false' END FROM workflows
         """)
-        
-        conn.commit()
-        conn.close()
+        for workflow_id, trigger_type, complexity, active in rows:
+            values.setdefault(('trigger_type', trigger_type or ''), []).append(workflow_id)
+            values.setdefault(('complexity', complexity or ''), []).append(workflow_id)
+            values.setdefault(('active', active), []).append(workflow_id)
+        for workflow_id, integration in conn.execute("SELECT workflow_id, integration FROM workflow_integrations"):
+            values.setdefault(('integrations', integration), []).append(workflow_id)
+        self.bitmaps = {key: _bitmap(ids) for key, ids in values.items()}
+    
+    def counts(self, matched: Optional[int], top_integrations: int) -> Dict[str, Any]:
+        """Facet counts within the matched bitmap, or over every workflow when it is None."""
+        facets = {'trigger_type': {}, 'complexity': {}, 'active': {'true': 0, 'false': 0}}
+        integrations = []
+        for (facet, value), bitmap in self.bitmaps.items():
+            count = (bitmap if matched is None else matched & bitmap).bit_count()
+            if not count:
+                continue
+            if facet == 'integrations':
+                integrations.append((-count, value))
+            else:
+                facets[facet][value] = count
+        facets['integrations'] = [{'name': value, 'count': -count}
+                                  for count, value in heapq.nsmallest(top_integrations, integrations)]
+        return facets
+
+
+class WorkflowAnalyzer:
+    """Derives a workflow's indexed metadata from its file; needs no database."""
+    
+    def __init__(self, hash_algorithm: str):
+        self.hash_algorithm = hash_algorithm
     
     def get_file_hash(self, file_path: str) -> str:
-        """Get MD5 hash of file for change detection."""
-        hash_md5 = hashlib.md5()
+        """Get hash of file for change detection using the configured algorithm."""
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            return hash_content(f.read(), self.hash_algorithm)
     
     def format_workflow_name(self, filename: str) -> str:
         """Convert filename to readable workflow name."""
@@ -147,18 +615,39 @@ class WorkflowDatabase:
         
         return ' '.join(readable_parts)
     
-    def analyze_workflow_file(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Analyze a single workflow file and extract metadata."""
+    def analyze_workflow_file(self, file_path: str, raw: bytes = None) -> Optional[Dict[str, Any]]:
+        """Analyze a single workflow file and extract metadata from one read, or from raw if given."""
+        if raw is None:
+            if os.path.getsize(file_path) >= STREAMING_PARSE_THRESHOLD:
+                return self.analyze_large_workflow_file(file_path)[0]
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = json.loads(raw)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"Error reading {file_path}: {str(e)}")
             return None
         
+        return self._build_workflow(file_path, data, hash_content(raw, self.hash_algorithm), len(raw))
+    
+    def analyze_large_workflow_file(self, file_path: str,
+                                    extra_algorithms: Tuple[str, ...] = ()) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """Analyze a workflow file with the streaming extractor; returns (workflow without connections, digests)."""
+        hashers = {algorithm: new_hasher(algorithm) for algorithm in (self.hash_algorithm, *extra_algorithms)}
+        try:
+            with open(file_path, 'rb') as f:
+                data, file_size = extract_workflow_fields(f, hashers.values())
+        except ValueError as e:
+            print(f"Error reading {file_path}: {str(e)}")
+            return None, {}
+        
+        digests = {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+        return self._build_workflow(file_path, data, digests[self.hash_algorithm], file_size), digests
+    
+    def _build_workflow(self, file_path: str, data: Dict[str, Any], file_hash: str, file_size: int) -> Dict[str, Any]:
+        """Derive the indexed metadata from a workflow's parsed JSON."""
         filename = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-        file_hash = self.get_file_hash(file_path)
         
         # Extract basic metadata
         workflow = {
@@ -198,6 +687,7 @@ class WorkflowDatabase:
         trigger_type, integrations = self.analyze_nodes(workflow['nodes'])
         workflow['trigger_type'] = trigger_type
         workflow['integrations'] = list(integrations)
+        workflow['node_types'] = sorted({node.get('type', '') for node in workflow['nodes']} - {''})
         
         # Generate description
         workflow['description'] = self.generate_description(workflow, trigger_type, integrations)
@@ -209,172 +699,19 @@ class WorkflowDatabase:
         trigger_type = 'Manual'
         integrations = set()
         
-        # Enhanced service mapping for better recognition
-        service_mappings = {
-            # Messaging & Communication
-            'telegram': 'Telegram',
-            'telegramTrigger': 'Telegram',
-            'discord': 'Discord',
-            'slack': 'Slack', 
-            'whatsapp': 'WhatsApp',
-            'mattermost': 'Mattermost',
-            'teams': 'Microsoft Teams',
-            'rocketchat': 'Rocket.Chat',
-            
-            # Email
-            'gmail': 'Gmail',
-            'mailjet': 'Mailjet',
-            'emailreadimap': 'Email (IMAP)',
-            'emailsendsmt': 'Email (SMTP)',
-            'outlook': 'Outlook',
-            
-            # Cloud Storage
-            'googledrive': 'Google Drive',
-            'googledocs': 'Google Docs',
-            'googlesheets': 'Google Sheets',
-            'dropbox': 'Dropbox',
-            'onedrive': 'OneDrive',
-            'box': 'Box',
-            
-            # Databases
-            'postgres': 'PostgreSQL',
-            'mysql': 'MySQL',
-            'mongodb': 'MongoDB',
-            'redis': 'Redis',
-            'airtable': 'Airtable',
-            'notion': 'Notion',
-            
-            # Project Management
-            'jira': 'Jira',
-            'github': 'GitHub',
-            'gitlab': 'GitLab',
-            'trello': 'Trello',
-            'asana': 'Asana',
-            'mondaycom': 'Monday.com',
-            
-            # AI/ML Services
-            'openai': 'OpenAI',
-            'anthropic': 'Anthropic',
-            'huggingface': 'Hugging Face',
-            
-            # Social Media
-            'linkedin': 'LinkedIn',
-            'twitter': 'Twitter/X',
-            'facebook': 'Facebook',
-            'instagram': 'Instagram',
-            
-            # E-commerce
-            'shopify': 'Shopify',
-            'stripe': 'Stripe',
-            'paypal': 'PayPal',
-            
-            # Analytics
-            'googleanalytics': 'Google Analytics',
-            'mixpanel': 'Mixpanel',
-            
-            # Calendar & Tasks
-            'googlecalendar': 'Google Calendar', 
-            'googletasks': 'Google Tasks',
-            'cal': 'Cal.com',
-            'calendly': 'Calendly',
-            
-            # Forms & Surveys
-            'typeform': 'Typeform',
-            'googleforms': 'Google Forms',
-            'form': 'Form Trigger',
-            
-            # Development Tools
-            'webhook': 'Webhook',
-            'httpRequest': 'HTTP Request',
-            'graphql': 'GraphQL',
-            'sse': 'Server-Sent Events',
-            
-            # Utility nodes (exclude from integrations)
-            'set': None,
-            'function': None,
-            'code': None,
-            'if': None,
-            'switch': None,
-            'merge': None,
-            'split': None,
-            'stickynote': None,
-            'stickyNote': None,
-            'wait': None,
-            'schedule': None,
-            'cron': None,
-            'manual': None,
-            'stopanderror': None,
-            'noop': None,
-            'noOp': None,
-            'error': None,
-            'limit': None,
-            'aggregate': None,
-            'summarize': None,
-            'filter': None,
-            'sort': None,
-            'removeDuplicates': None,
-            'dateTime': None,
-            'extractFromFile': None,
-            'convertToFile': None,
-            'readBinaryFile': None,
-            'readBinaryFiles': None,
-            'executionData': None,
-            'executeWorkflow': None,
-            'executeCommand': None,
-            'respondToWebhook': None,
-        }
-        
         for node in nodes:
-            node_type = node.get('type', '')
-            node_name = node.get('name', '').lower()
+            trigger_hint, service_name = classify_node(node.get('type', ''), node.get('name', '').lower())
             
             # Determine trigger type
-            if 'webhook' in node_type.lower() or 'webhook' in node_name:
+            if trigger_hint == 'webhook':
                 trigger_type = 'Webhook'
-            elif 'cron' in node_type.lower() or 'schedule' in node_type.lower():
+            elif trigger_hint == 'scheduled':
                 trigger_type = 'Scheduled'
-            elif 'trigger' in node_type.lower() and trigger_type == 'Manual':
-                if 'manual' not in node_type.lower():
-                    trigger_type = 'Webhook'
-            
-            # Extract integrations with enhanced mapping
-            service_name = None
-            
-            # Handle n8n-nodes-base nodes
-            if node_type.startswith('n8n-nodes-base.'):
-                raw_service = node_type.replace('n8n-nodes-base.', '').lower()
-                raw_service = raw_service.replace('trigger', '')
-                service_name = service_mappings.get(raw_service, raw_service.title() if raw_service else None)
-            
-            # Handle @n8n/ namespaced nodes
-            elif node_type.startswith('@n8n/'):
-                raw_service = node_type.split('.')[-1].lower() if '.' in node_type else node_type.lower()
-                raw_service = raw_service.replace('trigger', '')
-                service_name = service_mappings.get(raw_service, raw_service.title() if raw_service else None)
-            
-            # Handle custom nodes
-            elif '-' in node_type:
-                # Try to extract service name from custom node names like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
-                parts = node_type.lower().split('.')
-                for part in parts:
-                    if 'youtube' in part:
-                        service_name = 'YouTube'
-                        break
-                    elif 'telegram' in part:
-                        service_name = 'Telegram'
-                        break
-                    elif 'discord' in part:
-                        service_name = 'Discord'
-                        break
-            
-            # Also check node names for service hints
-            for service_key, service_value in service_mappings.items():
-                if service_key in node_name and service_value:
-                    service_name = service_value
-                    break
+            elif trigger_hint == 'trigger' and trigger_type == 'Manual':
+                trigger_type = 'Webhook'
             
             # Add to integrations if valid service found
-            if service_name and service_name not in ['None', None]:
+            if service_name:
                 integrations.add(service_name)
         
         # Determine if complex based on node variety and count
@@ -429,92 +766,789 @@ class WorkflowDatabase:
         
         return desc + "."
     
-    def index_all_workflows(self, force_reindex: bool = False) -> Dict[str, int]:
+    def prepare_workflow_row(self, file_path: str, known_hash: Optional[str] = None,
+                             known_algorithm: Optional[str] = None,
+                             file_stat: Tuple[int, int, int] = (None, None, None)) -> Tuple[str, Any]:
+        """Analyze one file for indexing: ('skipped', file_hash), ('errors', None) or ('processed', row)."""
+        try:
+            algorithm = known_algorithm or LEGACY_HASH_ALGORITHM
+            file_size = file_stat[0] if file_stat[0] is not None else os.path.getsize(file_path)
+            
+            if file_size >= STREAMING_PARSE_THRESHOLD:
+                # Hash with the stored algorithm too so the same pass can detect "unchanged"
+                extra = ()
+                if known_hash is not None and algorithm != self.hash_algorithm and hash_available(algorithm):
+                    extra = (algorithm,)
+                workflow_data, digests = self.analyze_large_workflow_file(file_path, extra)
+                if known_hash is not None and digests.get(algorithm) == known_hash:
+                    return 'skipped', digests[self.hash_algorithm]
+            else:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                
+                # Stored digest may not be computable here (e.g. xxhash missing)
+                if known_hash is not None and hash_available(algorithm):
+                    if hash_content(raw, algorithm) == known_hash:
+                        # Unchanged; re-key legacy digests to the configured algorithm
+                        if algorithm != self.hash_algorithm:
+                            return 'skipped', hash_content(raw, self.hash_algorithm)
+                        return 'skipped', known_hash
+                
+                workflow_data = self.analyze_workflow_file(file_path, raw)
+            
+            if not workflow_data:
+                return 'errors', None
+            
+            return 'processed', (
+                workflow_data['filename'],
+                workflow_data['name'],
+                workflow_data['workflow_id'],
+                workflow_data['active'],
+                workflow_data['description'],
+                workflow_data['trigger_type'],
+                workflow_data['complexity'],
+                workflow_data['node_count'],
+                json.dumps(workflow_data['integrations']),
+                json.dumps(workflow_data['tags']),
+                workflow_data['created_at'],
+                workflow_data['updated_at'],
+                workflow_data['file_hash'],
+                self.hash_algorithm,
+                workflow_data['file_size'],
+                file_stat[1],
+                file_stat[2],
+                json.dumps(workflow_data['node_types'])
+            )
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            return 'errors', None
+
+
+class WorkflowDatabase(WorkflowAnalyzer):
+    """High-performance SQLite database for workflow metadata and search."""
+    
+    def __init__(self, db_path: str = None, hash_algorithm: str = None,
+                 cache_size: int = None, cache_ttl: float = None):
+        # Use environment variable if no path provided
+        if db_path is None:
+            db_path = os.environ.get('WORKFLOW_DB_PATH', 'workflows.db')
+        self.db_path = db_path
+        self.workflows_dir = "workflows"
+        self.categories_file = CATEGORIES_FILE
+        super().__init__(self._resolve_hash_algorithm(hash_algorithm))
+        # Serializes index writers (API reindex, filesystem watcher)
+        self._index_lock = threading.Lock()
+        # Read connection pool: one tuned connection per thread, created on first use
+        self._local = threading.local()
+        self._pool: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._pool_epoch = 0
+        # (count SQL, params, generation) -> total for filtered searches
+        self._count_cache = _ResultCache(COUNT_CACHE_SIZE)
+        # Search and category pages of the current index generation
+        if cache_size is None:
+            cache_size = int(os.environ.get('WORKFLOW_CACHE_SIZE', RESULT_CACHE_SIZE))
+        if cache_ttl is None:
+            cache_ttl = float(os.environ.get('WORKFLOW_CACHE_TTL', RESULT_CACHE_TTL))
+        self._result_cache = _ResultCache(cache_size, cache_ttl or None)
+        self._cache_generation = None
+        # (database file signature, (generation, last_indexed)) of the last check
+        self._index_version = None
+        # Stat signature of categories_file as of the last import check
+        self._categories_signature = None
+        # (generation, _FacetBitmaps) behind get_search_facets
+        self._facets: Optional[Tuple[int, _FacetBitmaps]] = None
+        self._facet_lock = threading.Lock()
+        self._facet_refresh: Optional[Future] = None
+        # TF-IDF matrix behind get_similar_workflows, saved next to the database
+        self.similarity = SimilarityIndex(self.db_path + '.similar.npz')
+        self._similarity_refresh: Optional[Future] = None
+        # Bounded thread pool behind the async methods, created on first use
+        self.executor_threads = int(os.environ.get('WORKFLOW_DB_THREADS', DB_EXECUTOR_THREADS))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.init_database()
+    
+    @staticmethod
+    def _resolve_hash_algorithm(hash_algorithm: Optional[str]) -> str:
+        """Pick the change-detection digest from the argument or WORKFLOW_HASH_ALGORITHM."""
+        if hash_algorithm is None:
+            hash_algorithm = os.environ.get('WORKFLOW_HASH_ALGORITHM', DEFAULT_HASH_ALGORITHM)
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm '{hash_algorithm}', choose from {', '.join(HASH_ALGORITHMS)}")
+        if hash_algorithm.startswith('xxh') and xxhash is None:
+            raise ValueError(f"Hash algorithm '{hash_algorithm}' requires the xxhash package")
+        return hash_algorithm
+    
+    def init_database(self):
+        """Initialize SQLite database with optimized schema and indexes."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")  # Write-ahead logging for performance
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=10000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        # Create main workflows table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflows (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL,
+                workflow_id TEXT,
+                active BOOLEAN DEFAULT 0,
+                description TEXT,
+                trigger_type TEXT,
+                complexity TEXT,
+                node_count INTEGER DEFAULT 0,
+                integrations TEXT,  -- JSON array
+                tags TEXT,         -- JSON array
+                created_at TEXT,
+                updated_at TEXT,
+                file_hash TEXT,
+                hash_algorithm TEXT,  -- NULL means md5 (rows indexed by older versions)
+                file_size INTEGER,
+                file_mtime INTEGER,  -- st_mtime_ns
+                file_inode INTEGER,
+                node_types TEXT,  -- JSON array of distinct node types; NULL until reanalyzed
+                file_path TEXT,  -- relative to workflows_dir, '/'-separated
+                analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                category TEXT  -- copied from workflow_categories so the filter is one index range
+            )
+        """)
+        
+        # Bring databases created by older versions up to the current schema
+        added_columns = self._ensure_columns(conn, 'workflows', {
+            'hash_algorithm': 'TEXT',
+            'file_mtime': 'INTEGER',
+            'file_inode': 'INTEGER',
+            'file_path': 'TEXT',
+            'category': 'TEXT',
+            'node_types': 'TEXT',
+        })
+        
+        # Create FTS5 table for full-text search
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS workflows_fts USING fts5(
+                filename,
+                name,
+                description,
+                integrations,
+                tags,
+                content=workflows,
+                content_rowid=id
+            )
+        """)
+        
+        # Create indexes for fast filtering
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trigger_type ON workflows(trigger_type)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_complexity ON workflows(complexity)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_active ON workflows(active)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_node_count ON workflows(node_count)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_filename ON workflows(filename)")
+        # Default listing order; the implicit rowid makes (analyzed_at, id) the keyset
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_analyzed_at ON workflows(analyzed_at)")
+        
+        # Normalized integrations and tags so filters are indexed joins, not LIKE scans
+        existing_tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_integrations (
+                workflow_id INTEGER NOT NULL,  -- workflows.id
+                integration TEXT NOT NULL,
+                PRIMARY KEY (workflow_id, integration)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_tags (
+                workflow_id INTEGER NOT NULL,  -- workflows.id
+                tag TEXT NOT NULL,
+                PRIMARY KEY (workflow_id, tag)
+            ) WITHOUT ROWID
+        """)
+        # NOCASE: analyzer spellings vary ('YouTube' vs 'Youtube') and lookups ignore case
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_integration
+            ON workflow_integrations(integration COLLATE NOCASE, workflow_id)
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tag ON workflow_tags(tag, workflow_id)")
+        
+        # Category -> integration mapping used by search_by_category
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS service_categories (
+                category TEXT NOT NULL,
+                integration TEXT NOT NULL,
+                PRIMARY KEY (category, integration)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_service_category_integration ON service_categories(integration)")
+        # Rewritten only when the seed changed, so opening an existing database doesn't write
+        seed = {(category, integration)
+                for category, integrations in self.get_service_categories().items()
+                for integration in integrations}
+        if set(conn.execute("SELECT category, integration FROM service_categories")) != seed:
+            conn.execute("DELETE FROM service_categories")
+            conn.executemany("INSERT INTO service_categories (category, integration) VALUES (?, ?)", sorted(seed))
+        
+        # Filename -> category imported from categories_file by refresh_categories
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_categories (
+                filename TEXT PRIMARY KEY NOT NULL,  -- workflows.filename
+                category TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_workflow_category ON workflow_categories(category, filename)")
+        # Category filter in listing order; rows from before the column existed are filled in once
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_category ON workflows(category, analyzed_at)")
+        if 'category' in added_columns:
+            conn.execute(f"UPDATE workflows SET category = {CATEGORY_OF_SQL.format('workflows.filename')}")
+        
+        # Materialized aggregates served by get_stats: counters by key
+        # ('total', 'active', 'trigger:<type>', ..., 'last_indexed', the
+        # 'generation' bumped by every index write and the 'categories_source'
+        # stat signature of the imported category file) and
+        # per-integration workflow counts
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_stats (
+                key TEXT PRIMARY KEY NOT NULL,
+                value
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS integration_counts (
+                integration TEXT PRIMARY KEY NOT NULL,
+                workflow_count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        
+        # Create triggers to keep FTS, facet and stats tables in sync
+        self._create_triggers(conn, SYNC_TRIGGERS)
+        
+        # Databases indexed before these tables existed get them filled once
+        rebuild_facets = 'workflow_integrations' not in existing_tables or 'workflow_tags' not in existing_tables
+        if rebuild_facets:
+            self._rebuild_facets(conn)
+        if rebuild_facets or 'workflow_stats' not in existing_tables or 'integration_counts' not in existing_tables:
+            self._rebuild_stats(conn)
+        
+        conn.commit()
+        conn.close()
+    
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a tuned connection; read_only ones are for the per-thread pool."""
+        conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                               check_same_thread=not read_only)
+        conn.execute(f"PRAGMA cache_size=-{READ_CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            conn.execute(f"PRAGMA mmap_size={READ_MMAP_SIZE}")
+            conn.execute("PRAGMA query_only=ON")
+            conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _read_connection(self) -> sqlite3.Connection:
+        """This thread's pooled autocommit read connection, created once per thread."""
+        local = self._local
+        if getattr(local, 'epoch', None) != self._pool_epoch:
+            conn = self._connect(read_only=True)
+            with self._pool_lock:
+                self._pool.append(conn)
+                local.conn = conn
+                local.epoch = self._pool_epoch
+        return local.conn
+    
+    def _create_triggers(self, conn: sqlite3.Connection, triggers: Dict[str, str]):
+        """Create the given triggers, replacing any whose definition is outdated."""
+        existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"))
+        for name, sql in triggers.items():
+            if name in existing:
+                if ' '.join(existing[name].split()) == ' '.join(sql.split()):
+                    continue
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.execute(sql)
+    
+    def _rebuild_facets(self, conn: sqlite3.Connection):
+        """Refill workflow_integrations and workflow_tags from the workflows table."""
+        conn.execute("DELETE FROM workflow_integrations")
+        conn.execute("DELETE FROM workflow_tags")
+        conn.execute("""
+            INSERT OR IGNORE INTO workflow_integrations(workflow_id, integration)
+            SELECT w.id, value FROM workflows w, json_each(w.integrations)
+        """)
+        conn.execute(f"""
+            INSERT OR IGNORE INTO workflow_tags(workflow_id, tag)
+            SELECT w.id, {_TAG_NAME_SQL} FROM workflows w, json_each(w.tags)
+        """)
+    
+    def _rebuild_stats(self, conn: sqlite3.Connection):
+        """Recompute workflow_stats counters and integration_counts from scratch."""
+        conn.execute("DELETE FROM workflow_stats WHERE key NOT IN ('last_indexed', 'generation', 'categories_source')")
+        conn.execute("DELETE FROM integration_counts")
+        conn.execute("""
+            INSERT INTO workflow_stats(key, value)
+            SELECT 'total', COUNT(*) FROM workflows
+            UNION ALL SELECT 'active', COUNT(*) FROM workflows WHERE active
+            UNION ALL SELECT 'total_nodes', COALESCE(SUM(node_count), 0) FROM workflows
+            UNION ALL SELECT 'trigger:' || COALESCE(trigger_type, ''), COUNT(*) FROM workflows GROUP BY 1
+            UNION ALL SELECT 'complexity:' || COALESCE(complexity, ''), COUNT(*) FROM workflows GROUP BY 1
+        """)
+        conn.execute("""
+            INSERT INTO integration_counts(integration, workflow_count)
+            SELECT integration, COUNT(*) FROM workflow_integrations GROUP BY integration
+        """)
+        conn.execute("""
+            INSERT INTO workflow_stats(key, value)
+            SELECT 'unique_integrations', COUNT(*) FROM integration_counts
+        """)
+    
+    def _drop_sync_triggers(self, conn: sqlite3.Connection):
+        """Drop the FTS, facet and stats sync triggers ahead of a bulk load."""
+        for name in SYNC_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    
+    def _ensure_columns(self, conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> set:
+        """Add any missing columns to an existing table; returns the names added."""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        added = set()
+        for name, declaration in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+                added.add(name)
+        return added
+    
+    def _relative_path(self, file_path) -> str:
+        """Location of a workflow file as stored in workflows.file_path."""
+        return Path(os.path.relpath(file_path, self.workflows_dir)).as_posix()
+    
+    def index_all_workflows(self, force_reindex: bool = False, jobs: int = 1,
+                            bulk: Optional[bool] = None) -> Dict[str, Any]:
         """Index all workflow files. Only reprocesses changed files unless force_reindex=True."""
+        self.refresh_categories()
         if not os.path.exists(self.workflows_dir):
             print(f"Warning: Workflows directory '{self.workflows_dir}' not found.")
-            return {'processed': 0, 'skipped': 0, 'errors': 0}
+            return {'processed': 0, 'skipped': 0, 'errors': 0, 'removed': 0}
         workflows_path = Path(self.workflows_dir)
         json_files = list(workflows_path.rglob("*.json"))
         # json_files = glob.glob(os.path.join(self.workflows_dir, "*.json"), recursive=True)
         
         if not json_files:
             print(f"Warning: No JSON files found in '{self.workflows_dir}' directory.")
-            return {'processed': 0, 'skipped': 0, 'errors': 0}
+            return {'processed': 0, 'skipped': 0, 'errors': 0, 'removed': 0}
         
-        print(f"Indexing {len(json_files)} workflow files...")
-        
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
-        stats = {'processed': 0, 'skipped': 0, 'errors': 0}
+        return self._index_files(json_files, force_reindex=force_reindex, jobs=jobs,
+                                 bulk=bulk, full_scan=True)
+    
+    def index_workflow_files(self, file_paths: List[str], jobs: int = 1) -> Dict[str, Any]:
+        """Reindex only the given workflow files, removing rows of paths that no longer exist."""
+        json_files = [Path(p) for p in dict.fromkeys(file_paths) if str(p).endswith('.json')]
+        if not json_files:
+            return {'processed': 0, 'skipped': 0, 'errors': 0, 'removed': 0}
+        return self._index_files(json_files, jobs=jobs)
+    
+    def _index_files(self, json_files: List[Path], force_reindex: bool = False, jobs: int = 1,
+                     bulk: Optional[bool] = None, full_scan: bool = False) -> Dict[str, Any]:
+        """Analyze and write the given files; with full_scan, rows of files not among them are removed."""
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
         
-        for file_path in json_files:
-            filename = os.path.basename(file_path)
+        with self._index_lock:
+            start_time = time.perf_counter()
+            conn = self._connect()
             
-            try:
-                # Check if file needs to be reprocessed
-                if not force_reindex:
-                    current_hash = self.get_file_hash(file_path)
-                    cursor = conn.execute(
-                        "SELECT file_hash FROM workflows WHERE filename = ?", 
-                        (filename,)
-                    )
-                    row = cursor.fetchone()
-                    if row and row['file_hash'] == current_hash:
-                        stats['skipped'] += 1
-                        continue
-                
-                # Analyze workflow
-                workflow_data = self.analyze_workflow_file(file_path)
-                if not workflow_data:
+            # Load every known file signature in one query instead of once per file
+            cursor = conn.execute("""
+                SELECT filename, file_hash, hash_algorithm, file_size, file_mtime, file_inode, file_path,
+                       node_types IS NOT NULL, id
+                FROM workflows
+            """)
+            known_files = {row[0]: row[1:] for row in cursor}
+            
+            stats = {'processed': 0, 'skipped': 0, 'errors': 0, 'removed': 0}
+            tasks = []
+            present = set()
+            missing = set()
+            for file_path in json_files:
+                try:
+                    st = file_path.stat()
+                except FileNotFoundError:
+                    missing.add(file_path.name)
+                    continue
+                except OSError as e:
+                    print(f"Error processing {file_path}: {str(e)}")
                     stats['errors'] += 1
+                    present.add(file_path.name)
                     continue
                 
-                # Insert or update in database
-                conn.execute("""
-                    INSERT OR REPLACE INTO workflows (
-                        filename, name, workflow_id, active, description, trigger_type,
-                        complexity, node_count, integrations, tags, created_at, updated_at,
-                        file_hash, file_size, analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
-                    workflow_data['filename'],
-                    workflow_data['name'],
-                    workflow_data['workflow_id'],
-                    workflow_data['active'],
-                    workflow_data['description'],
-                    workflow_data['trigger_type'],
-                    workflow_data['complexity'],
-                    workflow_data['node_count'],
-                    json.dumps(workflow_data['integrations']),
-                    json.dumps(workflow_data['tags']),
-                    workflow_data['created_at'],
-                    workflow_data['updated_at'],
-                    workflow_data['file_hash'],
-                    workflow_data['file_size']
-                ))
+                present.add(file_path.name)
+                file_stat = (st.st_size, st.st_mtime_ns, st.st_ino)
+                known = known_files.get(file_path.name)
+                # A move keeps the stat signature, so the stored location is compared too
+                if (not force_reindex and known and known[1] == self.hash_algorithm
+                        and known[2:5] == file_stat and known[5] == self._relative_path(file_path) and known[6]):
+                    stats['skipped'] += 1
+                    continue
+                
+                # Rows indexed before node types were stored are analyzed again once
+                reuse_hash = known and known[6] and not force_reindex
+                known_hash, known_algorithm = known[:2] if reuse_hash else (None, None)
+                tasks.append((str(file_path), known_hash, known_algorithm, file_stat))
+            
+            if full_scan:
+                stale = [name for name in known_files if name not in present]
+            else:
+                # A file moved between directories shows up as missing and present
+                stale = [name for name in missing - present if name in known_files]
+            
+            jobs = max(1, min(jobs, len(tasks)))
+            if bulk is None:
+                bulk = force_reindex or len(tasks) >= BULK_INDEX_THRESHOLD
+            bulk = bulk and bool(tasks or stale)
+            mode = 'bulk' if bulk else 'incremental'
+            if full_scan or tasks:
+                print(f"Indexing {len(tasks)} of {len(json_files)} workflow files with {jobs} job(s) ({mode} mode)...")
+            
+            batch = []
+            stat_updates = []
+            # Filenames whose rows were written, for the similarity index
+            changed = []
+            generation = None
+            # Unchanged files whose stored path or digest changed; cached rows carry both
+            relocated = 0
+            executor = None
+            
+            try:
+                conn.execute("BEGIN")
+                if bulk:
+                    self._drop_sync_triggers(conn)
+                
+                if jobs > 1:
+                    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_index_worker,
+                                                   initargs=(self.hash_algorithm,))
+                    chunksize = max(1, len(tasks) // (jobs * 8))
+                    results = executor.map(_index_worker, tasks, chunksize=chunksize)
+                else:
+                    results = (self.prepare_workflow_row(*task) for task in tasks)
+                
+                for (file_path, _, _, file_stat), (status, payload) in zip(tasks, results):
+                    stats[status] += 1
+                    relative_path = self._relative_path(file_path)
+                    if status == 'skipped':
+                        # Content is unchanged but the stat, location or digest algorithm moved
+                        known = known_files.get(os.path.basename(file_path))
+                        if known is None or known[0] != payload or known[5] != relative_path:
+                            relocated += 1
+                        stat_updates.append((payload, self.hash_algorithm, *file_stat, relative_path,
+                                             os.path.basename(file_path)))
+                        continue
+                    if status != 'processed':
+                        continue
+                    batch.append(payload + (relative_path,))
+                    changed.append(payload[0])
+                    if len(batch) >= INDEX_BATCH_SIZE:
+                        conn.executemany(INSERT_WORKFLOW_SQL, batch)
+                        batch = []
+                
+                if batch:
+                    conn.executemany(INSERT_WORKFLOW_SQL, batch)
+                if stat_updates:
+                    conn.executemany(UPDATE_FILE_STAT_SQL, stat_updates)
+                if stale:
+                    conn.executemany("DELETE FROM workflows WHERE filename = ?", [(name,) for name in stale])
+                    stats['removed'] = len(stale)
                 
-                stats['processed'] += 1
+                if bulk:
+                    conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES('rebuild')")
+                    self._rebuild_facets(conn)
+                    self._rebuild_stats(conn)
+                    self._create_triggers(conn, SYNC_TRIGGERS)
                 
+                # Record when the index content last changed
+                if stats['processed'] or stats['removed'] or not self._get_last_indexed(conn):
+                    conn.execute("""
+                        INSERT INTO workflow_stats(key, value) VALUES ('last_indexed', ?)
+                        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                    """, (datetime.datetime.now().isoformat(),))
+                if stats['processed'] or stats['removed'] or relocated:
+                    generation = self._bump_generation(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+                conn.close()
+        
+        if (stats['processed'] or stats['removed']) and self._facets is not None:
+            self._try_refresh_facet_bitmaps()
+        if generation is not None and SimilarityIndex.available():
+            try:
+                self.similarity.update(self._read_connection(), generation, changed,
+                                       [known_files[name][7] for name in stale], verbose=True)
             except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
-                stats['errors'] += 1
-                continue
+                print(f"⚠️ Similarity index not updated: {e}")
         
-        conn.commit()
-        conn.close()
+        elapsed = time.perf_counter() - start_time
+        stats['elapsed'] = round(elapsed, 3)
+        # files_per_sec counts analyzed files; scanned_per_sec also counts skipped ones
+        stats['files_per_sec'] = round(stats['processed'] / elapsed, 1) if elapsed > 0 else 0.0
+        stats['scanned_per_sec'] = round(len(json_files) / elapsed, 1) if elapsed > 0 else 0.0
         
-        print(f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['errors']} errors")
+        print(f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, "
+              f"{stats['errors']} errors, {stats['removed']} removed")
+        if full_scan:
+            print(f"⏱️  {len(json_files)} files scanned in {elapsed:.3f}s ({stats['scanned_per_sec']:.0f} scanned/sec, "
+                  f"{stats['files_per_sec']:.0f} processed/sec, {jobs} job(s), {mode} mode)")
         return stats
     
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection) -> int:
+        """Bump the index generation in the caller's transaction; returns the new value."""
+        conn.execute("""
+            INSERT INTO workflow_stats(key, value) VALUES ('generation', 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+        """)
+        return conn.execute("SELECT value FROM workflow_stats WHERE key = 'generation'").fetchone()[0]
+    
+    def refresh_categories(self, force: bool = False) -> bool:
+        """Import categories_file into workflow_categories if its stat signature changed; returns whether it did."""
+        try:
+            st = os.stat(self.categories_file)
+            signature = f"{st.st_mtime_ns}:{st.st_size}:{st.st_ino}"
+        except OSError:
+            signature = ""
+        if not force and signature == self._categories_signature:
+            return False
+        if not self._index_lock.acquire(blocking=False):
+            return False
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT value FROM workflow_stats WHERE key = 'categories_source'").fetchone()
+                if not force and row is not None and row[0] == signature:
+                    self._categories_signature = signature
+                    return False
+                
+                mappings = {}
+                if signature:
+                    try:
+                        with open(self.categories_file, 'r', encoding='utf-8') as f:
+                            for item in json.load(f):
+                                if item.get('filename'):
+                                    mappings[item['filename']] = item.get('category') or UNCATEGORIZED
+                    except (OSError, ValueError, AttributeError) as e:
+                        # Keep the previous import; retried when the file changes again
+                        print(f"❌ Could not import categories from {self.categories_file}: {e}")
+                        self._categories_signature = signature
+                        return False
+                
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM workflow_categories")
+                conn.executemany("INSERT INTO workflow_categories (filename, category) VALUES (?, ?)",
+                                 mappings.items())
+                conn.execute(f"""
+                    UPDATE workflows SET category = {CATEGORY_OF_SQL.format('workflows.filename')}
+                    WHERE category IS NOT {CATEGORY_OF_SQL.format('workflows.filename')}
+                """)
+                conn.execute("""
+                    INSERT INTO workflow_stats(key, value) VALUES ('categories_source', ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """, (signature,))
+                generation = self._bump_generation(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                # e.g. a read-only database; readers keep the previous import
+                # and it's retried when the file changes again
+                conn.rollback()
+                print(f"⚠️ Could not store categories from {self.categories_file}: {e}")
+                self._categories_signature = signature
+                return False
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            self._categories_signature = signature
+            print(f"✅ Imported {len(mappings)} workflow categories from {self.categories_file}")
+            # Categories aren't vectorized, so a current similarity index only moves to the new generation
+            if SimilarityIndex.available() and self.similarity.generation == generation - 1:
+                try:
+                    self.similarity.update(self._read_connection(), generation)
+                except Exception as e:
+                    print(f"⚠️ Similarity index not updated: {e}")
+            return True
+        finally:
+            self._index_lock.release()
+    
     def search_workflows(self, query: str = "", trigger_filter: str = "all", 
                         complexity_filter: str = "all", active_only: bool = False,
-                        limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
-        """Fast search with filters and pagination."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+                        limit: int = 50, offset: int = 0,
+                        integration_filter: str = "all",
+                        cursor: Optional[str] = None,
+                        category_filter: str = "all") -> Tuple[List[Dict], int]:
+        """Fast search with filters and pagination; a cursor from next_cursor() replaces offset."""
+        key = ('search', ' '.join(query.split()), trigger_filter, complexity_filter,
+               bool(active_only), integration_filter.lower(), category_filter, limit,
+               None if cursor else offset, cursor)
+        return self._cached(key, lambda: self._search_workflows(
+            query, trigger_filter, complexity_filter, active_only,
+            limit, offset, integration_filter, cursor, category_filter))
+    
+    def _search_workflows(self, query: str, trigger_filter: str, complexity_filter: str,
+                          active_only: bool, limit: int, offset: int,
+                          integration_filter: str, cursor: Optional[str],
+                          category_filter: str) -> Tuple[List[Dict], int]:
+        conn = self._read_connection()
+        fts = bool(query.strip())
+        scope = self._cursor_scope(query=query, trigger_filter=trigger_filter,
+                                   complexity_filter=complexity_filter, active_only=active_only,
+                                   integration_filter=integration_filter, category_filter=category_filter)
+        after = self._cursor_position(cursor, scope) if cursor else None
+        
+        base_query, params = self._search_filter(query, trigger_filter, complexity_filter, active_only,
+                                                 integration_filter, category_filter)
+        base_query = ("SELECT w.*, rank " if fts else "SELECT w.*, 0 as rank ") + base_query
+        
+        # Count total results: plain listings read the materialized counters,
+        # everything else is counted once per index generation
+        counter = None
+        if not fts and integration_filter == "all" and category_filter == "all":
+            filters = [key for key, enabled in (
+                ('active', active_only),
+                (f'trigger:{trigger_filter}', trigger_filter != "all"),
+                (f'complexity:{complexity_filter}', complexity_filter != "all"),
+            ) if enabled]
+            if len(filters) <= 1:
+                counter = filters[0] if filters else 'total'
+        if counter is not None:
+            row = conn.execute("SELECT value FROM workflow_stats WHERE key = ?", (counter,)).fetchone()
+            total = row[0] if row else 0
+        else:
+            total = self._count(conn, f"SELECT COUNT(*) FROM ({base_query})", params)
+        
+        # Get paginated results; id breaks ties so pages never overlap
+        if after is not None and not fts:
+            # Keyset: resume strictly after the previous page's last (analyzed_at, id)
+            base_query, params = self._newest_after(base_query, params, after, limit)
+        else:
+            if after is not None:
+                base_query += " AND (rank, w.id) > (?, ?)"
+                params.extend(after)
+                offset = 0
+            if fts:
+                base_query += " ORDER BY rank, w.id"
+            else:
+                base_query += " ORDER BY w.analyzed_at DESC, w.id DESC"
+            
+            # Bound LIMIT/OFFSET keep the SQL text stable for the statement cache
+            base_query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        
+        cursor = conn.execute(base_query, params)
+        rows = cursor.fetchall()
         
+        # Convert to dictionaries and parse JSON fields
+        results = [self._workflow_from_row(row) for row in rows]
+        
+        return results, total
+    
+    def get_search_facets(self, query: str = "", trigger_filter: str = "all",
+                          complexity_filter: str = "all", active_only: bool = False,
+                          integration_filter: str = "all", category_filter: str = "all",
+                          top_integrations: int = 10) -> Dict[str, Any]:
+        """Counts per trigger_type, complexity, active state and top integration over all matches of a search."""
+        # Counts from bitmaps still being rebuilt are cached apart from the final ones
+        bitmaps_generation, bitmaps = self._facet_bitmaps()
+        key = ('facets', bitmaps_generation, ' '.join(query.split()), trigger_filter, complexity_filter,
+               bool(active_only), integration_filter.lower(), category_filter, top_integrations)
+        return self._cached(key, lambda: self._search_facets(
+            bitmaps, query, trigger_filter, complexity_filter, active_only,
+            integration_filter, category_filter, top_integrations))
+    
+    def _search_facets(self, bitmaps: _FacetBitmaps, query: str, trigger_filter: str, complexity_filter: str,
+                       active_only: bool, integration_filter: str, category_filter: str,
+                       top_integrations: int) -> Dict[str, Any]:
+        if not query.strip() and not active_only and all(
+                value == "all" for value in (trigger_filter, complexity_filter, integration_filter, category_filter)):
+            return bitmaps.counts(None, top_integrations)
+        conn = self._read_connection()
+        base_query, params = self._search_filter(query, trigger_filter, complexity_filter, active_only,
+                                                 integration_filter, category_filter)
+        # Only ids are read, usually from a covering index or the FTS match
+        matched = _bitmap(row[0] for row in conn.execute(f"SELECT w.id {base_query}", params))
+        return bitmaps.counts(matched, top_integrations)
+    
+    def _facet_bitmaps(self) -> Tuple[int, _FacetBitmaps]:
+        """(generation, bitmaps) to count with; outdated ones are served while a rebuild runs in the background."""
+        facets = self._facets
+        if facets is None:
+            return self.refresh_facet_bitmaps()
+        if facets[0] != self.get_generation() and (self._facet_refresh is None or self._facet_refresh.done()):
+            self._facet_refresh = self._get_executor().submit(self._try_refresh_facet_bitmaps)
+        return facets
+    
+    def refresh_facet_bitmaps(self) -> Tuple[int, _FacetBitmaps]:
+        """Rebuild the facet bitmaps unless they match the current index generation."""
+        with self._facet_lock:
+            generation = self.get_generation()
+            if self._facets is None or self._facets[0] != generation:
+                start_time = time.perf_counter()
+                self._facets = (generation, _FacetBitmaps(self._read_connection()))
+                print(f"🔄 Built {len(self._facets[1].bitmaps)} facet bitmaps in "
+                      f"{time.perf_counter() - start_time:.2f}s")
+            return self._facets
+    
+    def _try_refresh_facet_bitmaps(self):
+        try:
+            self.refresh_facet_bitmaps()
+        except Exception as e:
+            print(f"⚠️ Facet bitmaps not rebuilt: {e}")
+    
+    def get_similar_workflows(self, filename: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Up to k workflows most similar to filename, each with its 'similarity'; None if it isn't indexed."""
+        # Results from a build still being refreshed are cached apart from the refreshed ones
+        index = self._similarity_index()
+        return self._cached(('similar', index.generation, filename, k),
+                            lambda: self._get_similar_workflows(index, filename, k))
+    
+    def _get_similar_workflows(self, index: SimilarityIndex, filename: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        conn = self._read_connection()
+        row = conn.execute("SELECT id FROM workflows WHERE filename = ?", (filename,)).fetchone()
+        if row is None:
+            return None
+        matches = index.similar(row['id'], k)
+        if not matches:
+            return [] if matches is not None else None
+        rows = conn.execute(
+            "SELECT * FROM workflows WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([workflow_id for workflow_id, _ in matches]),)
+        )
+        found = {row['id']: self._workflow_from_row(row) for row in rows}
+        results = []
+        for workflow_id, score in matches:
+            if workflow_id in found:
+                found[workflow_id]['similarity'] = round(score, 4)
+                results.append(found[workflow_id])
+        return results
+    
+    def _similarity_index(self) -> SimilarityIndex:
+        """The similarity index as last built; an outdated one is synced in the background meanwhile."""
+        generation = self.get_generation()
+        if not self.similarity.load():
+            # Nothing built or saved yet, so there is no previous build to answer from
+            self.similarity.sync(self._read_connection(), generation)
+        elif self.similarity.generation != generation and (
+                self._similarity_refresh is None or self._similarity_refresh.done()):
+            self._similarity_refresh = self._get_executor().submit(self._try_sync_similarity)
+        return self.similarity
+    
+    def _try_sync_similarity(self):
+        try:
+            self.similarity.sync(self._read_connection(), self.get_generation())
+        except Exception as e:
+            print(f"⚠️ Similarity index not updated: {e}")
+    
+    @staticmethod
+    def _search_filter(query: str, trigger_filter: str, complexity_filter: str, active_only: bool,
+                       integration_filter: str, category_filter: str) -> Tuple[str, List]:
+        """FROM and WHERE clauses (workflows aliased w) matching a search, with their parameters."""
         # Build WHERE clause
         where_conditions = []
         params = []
@@ -530,105 +1564,268 @@ class WorkflowDatabase:
             where_conditions.append("w.complexity = ?")
             params.append(complexity_filter)
         
+        if integration_filter != "all":
+            where_conditions.append(
+                "w.id IN (SELECT workflow_id FROM workflow_integrations WHERE integration = ? COLLATE NOCASE)"
+            )
+            params.append(integration_filter)
+        
+        if category_filter != "all":
+            where_conditions.append("w.category = ?")
+            params.append(category_filter)
+        
         # Use FTS search if query provided
         if query.strip():
-            # FTS search with ranking
+            # FTS search with ranking. CROSS JOIN pins the MATCH as the outer
+            # loop; otherwise the planner may walk idx_complexity and run the
+            # MATCH once per workflow (seconds at 100k rows).
             base_query = """
-                SELECT w.*, rank
                 FROM workflows_fts fts
-                JOIN workflows w ON w.id = fts.rowid
+                CROSS JOIN workflows w ON w.id = fts.rowid
                 WHERE workflows_fts MATCH ?
             """
             params.insert(0, query)
         else:
             # Regular query without FTS
             base_query = """
-                SELECT w.*, 0 as rank
                 FROM workflows w
                 WHERE 1=1
             """
         
         if where_conditions:
             base_query += " AND " + " AND ".join(where_conditions)
+        return base_query, params
+    
+    @staticmethod
+    def _newest_after(base_query: str, params: List, after: Tuple[Any, int],
+                      limit: int) -> Tuple[str, List]:
+        """Keyset page of base_query (aliasing workflows as w), newest first."""
+        # The rest of the cursor's analyzed_at tie group and the older rows are
+        # read as two index ranges; SQLite only seeks a row value on its first column
+        analyzed_at, last_id = after
+        query = f"""
+            SELECT * FROM (
+                SELECT * FROM ({base_query} AND w.analyzed_at = ? AND w.id < ? ORDER BY w.id DESC LIMIT ?)
+                UNION ALL
+                SELECT * FROM ({base_query} AND w.analyzed_at < ? ORDER BY w.analyzed_at DESC, w.id DESC LIMIT ?)
+            )
+            ORDER BY analyzed_at DESC, id DESC
+            LIMIT ?
+        """
+        return query, (params + [analyzed_at, last_id, limit] +
+                       params + [analyzed_at, limit, limit])
+    
+    @staticmethod
+    def _workflow_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """A workflows row as a dict with integrations and tags decoded and indexer columns dropped."""
+        workflow = dict(row)
+        for column in INDEXER_COLUMNS:
+            workflow.pop(column, None)
+        workflow['integrations'] = json.loads(workflow['integrations'] or '[]')
+        workflow['node_types'] = json.loads(workflow.get('node_types') or '[]')
         
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM ({base_query}) t"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()['total']
+        # Parse tags and convert dict tags to strings
+        raw_tags = json.loads(workflow['tags'] or '[]')
+        clean_tags = []
+        for tag in raw_tags:
+            if isinstance(tag, dict):
+                # Extract name from tag dict if available
+                clean_tags.append(tag.get('name', str(tag.get('id', 'tag'))))
+            else:
+                clean_tags.append(str(tag))
+        workflow['tags'] = clean_tags
+        return workflow
+    
+    def get_workflow(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Metadata of one workflow by exact filename, or None if it isn't indexed."""
+        return self._cached(('workflow', filename), lambda: self._get_workflow(filename))
+    
+    def _get_workflow(self, filename: str) -> Optional[Dict[str, Any]]:
+        conn = self._read_connection()
+        row = conn.execute("SELECT * FROM workflows WHERE filename = ?", (filename,)).fetchone()
+        return self._workflow_from_row(row) if row is not None else None
+    
+    def get_workflows(self, filenames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Metadata of several workflows by exact filename, in the order requested, skipping unindexed ones."""
+        conn = self._read_connection()
+        rows = conn.execute(
+            "SELECT * FROM workflows WHERE filename IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(filenames)),)
+        )
+        found = {row['filename']: self._workflow_from_row(row) for row in rows}
+        return {name: found[name] for name in filenames if name in found}
+    
+    def iter_workflows(self, query: str = "", trigger_filter: str = "all",
+                       complexity_filter: str = "all", active_only: bool = False,
+                       integration_filter: str = "all", category_filter: str = "all",
+                       batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Every workflow a search matches, in id order, as lists of up to batch_size from one keyset query each."""
+        base_query, params = self._search_filter(query, trigger_filter, complexity_filter, active_only,
+                                                 integration_filter, category_filter)
+        # FTS5 seeks a rowid range of its matches directly, instead of
+        # collecting and sorting every match for each batch
+        key = "fts.rowid" if query.strip() else "w.id"
+        last_id = 0
+        while True:
+            rows = self._read_connection().execute(
+                f"SELECT w.* {base_query} AND {key} > ? ORDER BY {key} LIMIT ?",
+                params + [last_id, batch_size]
+            ).fetchall()
+            if not rows:
+                return
+            yield [self._workflow_from_row(row) for row in rows]
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
+    
+    def export_ndjson(self, **filters) -> Iterator[bytes]:
+        """Every workflow matching the filters of iter_workflows as newline-delimited JSON, one chunk per batch."""
+        for batch in self.iter_workflows(**filters):
+            yield "".join(
+                json.dumps(workflow, ensure_ascii=False, separators=(',', ':')) + "\n" for workflow in batch
+            ).encode('utf-8')
+    
+    def workflow_file_path(self, workflow: Dict[str, Any]) -> Optional[str]:
+        """Path of a workflow file from its metadata (get_workflow/get_workflows)."""
+        if workflow.get('file_path') is not None:
+            return os.path.join(self.workflows_dir, workflow['file_path'])
+        for path in Path(self.workflows_dir).rglob(glob.escape(workflow['filename'])):
+            return str(path)
+        return None
+    
+    def get_workflow_path(self, filename: str) -> Optional[str]:
+        """Path of an indexed workflow file from its filename, or None if it isn't indexed."""
+        conn = self._read_connection()
+        row = conn.execute("SELECT filename, file_path FROM workflows WHERE filename = ?", (filename,)).fetchone()
+        return self.workflow_file_path(dict(row)) if row is not None else None
+    
+    def _file_signature(self) -> Optional[tuple]:
+        """Stat signature of the database and its WAL; any commit changes it."""
+        signature = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                st = os.stat(path)
+            except OSError:
+                if path == self.db_path:
+                    return None
+                signature.append(None)
+                continue
+            signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(signature)
+    
+    def get_index_version(self) -> Tuple[int, Optional[str]]:
+        """(generation, last_indexed) of the index, re-read only when the database files changed on disk."""
+        signature = self._file_signature()
+        memo = self._index_version
+        if memo is None or signature is None or memo[0] != signature:
+            conn = self._read_connection()
+            values = dict(conn.execute(
+                "SELECT key, value FROM workflow_stats WHERE key IN ('generation', 'last_indexed')"
+            ))
+            memo = (signature, (values.get('generation', 0), values.get('last_indexed')))
+            self._index_version = memo
+        return memo[1]
+    
+    def get_generation(self) -> int:
+        """Counter bumped by every index run that changed rows."""
+        return self.get_index_version()[0]
+    
+    def _cached(self, key: tuple, compute):
+        """Return compute() through the result cache of the current index generation."""
+        generation = self.get_generation()
+        if generation != self._cache_generation:
+            # Another run (possibly another process) rewrote the index
+            self._result_cache.clear()
+            self._cache_generation = generation
         
-        # Get paginated results
-        if query.strip():
-            base_query += " ORDER BY rank"
+        value = self._result_cache.get((generation,) + key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self._result_cache.put((generation,) + key, value)
+        return value
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters of the search result cache, for sizing it."""
+        stats = self._result_cache.stats()
+        stats['generation'] = self._cache_generation
+        stats['count_cache'] = self._count_cache.stats()
+        return stats
+    
+    def _count(self, conn: sqlite3.Connection, count_query: str, params: List) -> int:
+        """Run a COUNT query, reusing its result until the index generation changes."""
+        key = (count_query, tuple(params), self.get_generation())
+        total = self._count_cache.get(key)
+        if total is None:
+            total = conn.execute(count_query, params).fetchone()[0]
+            self._count_cache.put(key, total)
+        return total
+    
+    @staticmethod
+    def _cursor_scope(**search) -> str:
+        """Short fingerprint of the search a cursor was issued for."""
+        digest = hashlib.blake2b(json.dumps(search, sort_keys=True).encode('utf-8'), digest_size=6)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Any]:
+        """Decode an opaque pagination cursor into its scope, position and page; raises ValueError if malformed."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            sort_key, last_id = data['after']
+            return {'scope': str(data['scope']), 'after': (sort_key, int(last_id)), 'page': int(data['page'])}
+        except (ValueError, TypeError, KeyError, UnicodeError):
+            raise ValueError("Invalid pagination cursor")
+    
+    def _cursor_position(self, cursor: str, scope: str) -> Tuple[Any, int]:
+        decoded = self.decode_cursor(cursor)
+        if decoded['scope'] != scope:
+            raise ValueError("Pagination cursor belongs to a different search")
+        return decoded['after']
+    
+    def next_cursor(self, results: List[Dict], page: int, limit: int, total: int,
+                    category: Optional[str] = None, query: str = "",
+                    trigger_filter: str = "all", complexity_filter: str = "all",
+                    active_only: bool = False, integration_filter: str = "all",
+                    category_filter: str = "all") -> Optional[str]:
+        """Opaque cursor for the page after results, or None on the last page; pass the search that produced them."""
+        if not results or len(results) < limit or page * limit >= total:
+            return None
+        if category is not None:
+            scope = self._cursor_scope(category=category)
+            sort_column = 'analyzed_at'
         else:
-            base_query += " ORDER BY w.analyzed_at DESC"
-        
-        base_query += f" LIMIT {limit} OFFSET {offset}"
-        
-        cursor = conn.execute(base_query, params)
-        rows = cursor.fetchall()
-        
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow['integrations'] = json.loads(workflow['integrations'] or '[]')
-            
-            # Parse tags and convert dict tags to strings
-            raw_tags = json.loads(workflow['tags'] or '[]')
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    # Extract name from tag dict if available
-                    clean_tags.append(tag.get('name', str(tag.get('id', 'tag'))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow['tags'] = clean_tags
-            
-            results.append(workflow)
-        
-        conn.close()
-        return results, total
+            scope = self._cursor_scope(query=query, trigger_filter=trigger_filter,
+                                       complexity_filter=complexity_filter, active_only=active_only,
+                                       integration_filter=integration_filter, category_filter=category_filter)
+            sort_column = 'rank' if query.strip() else 'analyzed_at'
+        last = results[-1]
+        data = {'scope': scope, 'after': [last[sort_column], last['id']], 'page': page + 1}
+        encoded = base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        return encoded.decode('ascii').rstrip('=')
+    
+    def _get_last_indexed(self, conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM workflow_stats WHERE key = 'last_indexed'").fetchone()
+        return row[0] if row else None
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
-        # Basic counts
-        cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
-        total = cursor.fetchone()['total']
-        
-        cursor = conn.execute("SELECT COUNT(*) as active FROM workflows WHERE active = 1")
-        active = cursor.fetchone()['active']
-        
-        # Trigger type breakdown
-        cursor = conn.execute("""
-            SELECT trigger_type, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY trigger_type
-        """)
-        triggers = {row['trigger_type']: row['count'] for row in cursor.fetchall()}
-        
-        # Complexity breakdown
-        cursor = conn.execute("""
-            SELECT complexity, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY complexity
-        """)
-        complexity = {row['complexity']: row['count'] for row in cursor.fetchall()}
-        
-        # Node stats
-        cursor = conn.execute("SELECT SUM(node_count) as total_nodes FROM workflows")
-        total_nodes = cursor.fetchone()['total_nodes'] or 0
+        """Get database statistics from the materialized workflow_stats table."""
+        conn = self._read_connection()
+        counters = dict(conn.execute("SELECT key, value FROM workflow_stats"))
         
-        # Unique integrations count
-        cursor = conn.execute("SELECT integrations FROM workflows WHERE integrations != '[]'")
-        all_integrations = set()
-        for row in cursor.fetchall():
-            integrations = json.loads(row['integrations'])
-            all_integrations.update(integrations)
+        total = counters.get('total', 0)
+        active = counters.get('active', 0)
         
-        conn.close()
+        # Trigger type and complexity breakdowns, omitting values no row has anymore
+        triggers = {}
+        complexity = {}
+        for key, value in counters.items():
+            if not value:
+                continue
+            if key.startswith('trigger:'):
+                triggers[key[len('trigger:'):]] = value
+            elif key.startswith('complexity:'):
+                complexity[key[len('complexity:'):]] = value
         
         return {
             'total': total,
@@ -636,11 +1833,45 @@ class WorkflowDatabase:
             'inactive': total - active,
             'triggers': triggers,
             'complexity': complexity,
-            'total_nodes': total_nodes,
-            'unique_integrations': len(all_integrations),
-            'last_indexed': datetime.datetime.now().isoformat()
+            'total_nodes': counters.get('total_nodes', 0),
+            'unique_integrations': counters.get('unique_integrations', 0),
+            'last_indexed': counters.get('last_indexed')
         }
 
+    def get_integrations(self, prefix: str = "", sort: str = "count") -> List[Dict[str, Any]]:
+        """Indexed integrations with workflow counts from integration_counts, filtered by prefix, sorted by count or name."""
+        if sort not in ("count", "name"):
+            raise ValueError(f"Unsupported integration sort '{sort}', choose from count, name")
+        
+        def compute():
+            conn = self._read_connection()
+            order = "integration COLLATE NOCASE"
+            if sort == "count":
+                order = "workflow_count DESC, " + order
+            pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            rows = conn.execute(f"""
+                SELECT integration, workflow_count FROM integration_counts
+                WHERE integration LIKE ? ESCAPE '\\'
+                ORDER BY {order}
+            """, (pattern,))
+            return [{'name': name, 'count': count} for name, count in rows]
+        return self._cached(('integrations', prefix.lower(), sort), compute)
+    
+    def get_categories(self) -> List[str]:
+        """Sorted workflow categories imported from categories_file, always including UNCATEGORIZED."""
+        def compute():
+            conn = self._read_connection()
+            categories = {row[0] for row in conn.execute("SELECT DISTINCT category FROM workflow_categories")}
+            return sorted(categories | {UNCATEGORIZED})
+        return self._cached(('categories',), compute)
+    
+    def get_category_mappings(self) -> Dict[str, str]:
+        """Filename -> category for every workflow listed in categories_file."""
+        def compute():
+            conn = self._read_connection()
+            return dict(conn.execute("SELECT filename, category FROM workflow_categories"))
+        return self._cached(('category_mappings',), compute)
+    
     def get_service_categories(self) -> Dict[str, List[str]]:
         """Get service categories for enhanced filtering."""
         return {
@@ -658,84 +1889,188 @@ class WorkflowDatabase:
             'development': ['Webhook', 'HTTP Request', 'GraphQL', 'Server-Sent Events', 'YouTube']
         }
 
-    def search_by_category(self, category: str, limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
-        """Search workflows by service category."""
+    def search_by_category(self, category: str, limit: int = 50, offset: int = 0,
+                           cursor: Optional[str] = None) -> Tuple[List[Dict], int]:
+        """Search workflows by service category; a cursor from next_cursor() replaces offset."""
+        key = ('category', category, limit, None if cursor else offset, cursor)
+        return self._cached(key, lambda: self._search_by_category(category, limit, offset, cursor))
+    
+    def _search_by_category(self, category: str, limit: int, offset: int,
+                            cursor: Optional[str]) -> Tuple[List[Dict], int]:
         categories = self.get_service_categories()
         if category not in categories:
             return [], 0
+        after = self._cursor_position(cursor, self._cursor_scope(category=category)) if cursor else None
         
-        services = categories[category]
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._read_connection()
         
-        # Build OR conditions for all services in category
-        service_conditions = []
-        params = []
-        for service in services:
-            service_conditions.append("integrations LIKE ?")
-            params.append(f'%"{service}"%')
-        
-        where_clause = " OR ".join(service_conditions)
+        # Indexed join: category -> integrations -> workflow ids
+        matching_ids = """
+            SELECT wi.workflow_id
+            FROM service_categories sc
+            JOIN workflow_integrations wi ON wi.integration = sc.integration COLLATE NOCASE
+            WHERE sc.category = ?
+        """
+        params = [category]
         
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM workflows WHERE {where_clause}"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()['total']
+        # Count total results (once per index generation)
+        total = self._count(conn, f"SELECT COUNT(DISTINCT workflow_id) FROM ({matching_ids})", params)
         
-        # Get paginated results
-        query = f"""
-            SELECT * FROM workflows 
-            WHERE {where_clause}
-            ORDER BY analyzed_at DESC
-            LIMIT {limit} OFFSET {offset}
-        """
+        # Get paginated results, resuming after the cursor's (analyzed_at, id)
+        query = f"SELECT w.* FROM workflows w WHERE w.id IN ({matching_ids})"
+        if after is not None:
+            query, params = self._newest_after(query, params, after, limit)
+        else:
+            query += " ORDER BY w.analyzed_at DESC, w.id DESC LIMIT ? OFFSET ?"
+            params += [limit, offset]
         
         cursor = conn.execute(query, params)
         rows = cursor.fetchall()
         
         # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow['integrations'] = json.loads(workflow['integrations'] or '[]')
-            raw_tags = json.loads(workflow['tags'] or '[]')
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    clean_tags.append(tag.get('name', str(tag.get('id', 'tag'))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow['tags'] = clean_tags
-            results.append(workflow)
+        results = [self._workflow_from_row(row) for row in rows]
         
-        conn.close()
         return results, total
 
+    async def run_async(self, func, *args, **kwargs):
+        """Await a blocking call run on the bounded database executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """The bounded database executor, created on first use."""
+        with self._pool_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.executor_threads,
+                                                    thread_name_prefix='workflow-db')
+            return self._executor
+    
+    async def search_workflows_async(self, *args, **kwargs) -> Tuple[List[Dict], int]:
+        """search_workflows on the database executor."""
+        return await self.run_async(self.search_workflows, *args, **kwargs)
+    
+    async def get_search_facets_async(self, *args, **kwargs) -> Dict[str, Any]:
+        """get_search_facets on the database executor."""
+        return await self.run_async(self.get_search_facets, *args, **kwargs)
+    
+    async def search_by_category_async(self, *args, **kwargs) -> Tuple[List[Dict], int]:
+        """search_by_category on the database executor."""
+        return await self.run_async(self.search_by_category, *args, **kwargs)
+    
+    async def get_index_version_async(self) -> Tuple[int, Optional[str]]:
+        """get_index_version on the database executor."""
+        return await self.run_async(self.get_index_version)
+    
+    async def get_stats_async(self) -> Dict[str, Any]:
+        """get_stats on the database executor."""
+        return await self.run_async(self.get_stats)
+    
+    async def get_integrations_async(self, prefix: str = "", sort: str = "count") -> List[Dict[str, Any]]:
+        """get_integrations on the database executor."""
+        return await self.run_async(self.get_integrations, prefix, sort)
+    
+    async def get_categories_async(self) -> List[str]:
+        """get_categories on the database executor."""
+        return await self.run_async(self.get_categories)
+    
+    async def get_category_mappings_async(self) -> Dict[str, str]:
+        """get_category_mappings on the database executor."""
+        return await self.run_async(self.get_category_mappings)
+    
+    async def get_similar_workflows_async(self, filename: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """get_similar_workflows on the database executor."""
+        return await self.run_async(self.get_similar_workflows, filename, k)
+    
+    async def get_workflow_async(self, filename: str) -> Optional[Dict[str, Any]]:
+        """get_workflow on the database executor."""
+        return await self.run_async(self.get_workflow, filename)
+    
+    async def get_workflows_async(self, filenames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """get_workflows on the database executor."""
+        return await self.run_async(self.get_workflows, filenames)
+    
+    async def get_workflow_path_async(self, filename: str) -> Optional[str]:
+        """get_workflow_path on the database executor."""
+        return await self.run_async(self.get_workflow_path, filename)
+    
     def close(self):
-        """Close database connection (stub method for compatibility)."""
-        # SQLite connections are automatically closed when they go out of scope
-        # This method exists for API compatibility
-        pass
+        """Stop the async executor and close every pooled read connection."""
+        with self._pool_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+            self._pool_epoch += 1
+        for conn in pool:
+            conn.close()
+
+
+# Per-process analyzer used by the index_all_workflows process pool
+_worker_analyzer: Optional[WorkflowAnalyzer] = None
+
+
+def _init_index_worker(hash_algorithm: str):
+    """Create the analyzer for a pool worker."""
+    global _worker_analyzer
+    _worker_analyzer = WorkflowAnalyzer(hash_algorithm)
+
+
+def _index_worker(task: tuple) -> Tuple[str, Any]:
+    """Pool entry point: hash and analyze one (file_path, known_hash, known_algorithm, file_stat) task."""
+    return _worker_analyzer.prepare_workflow_row(*task)
 
 
 def main():
     """Command-line interface for workflow database."""
     import argparse
+    import sys
     
     parser = argparse.ArgumentParser(description='N8N Workflow Database')
     parser.add_argument('--index', action='store_true', help='Index all workflows')
     parser.add_argument('--force', action='store_true', help='Force reindex all files')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for indexing (0 = all CPU cores)')
     parser.add_argument('--search', help='Search workflows')
     parser.add_argument('--stats', action='store_true', help='Show database statistics')
+    parser.add_argument('--export', nargs='?', const='-', metavar='PATH',
+                        help='Export workflows as NDJSON to PATH (default: stdout); --search and the filters below apply')
+    parser.add_argument('--trigger', default='all', help='Export filter: trigger type')
+    parser.add_argument('--complexity', default='all', help='Export filter: complexity')
+    parser.add_argument('--integration', default='all', help='Export filter: integration (case-insensitive)')
+    parser.add_argument('--category', default='all', help='Export filter: category')
+    parser.add_argument('--active-only', action='store_true', help='Export filter: only active workflows')
     
     args = parser.parse_args()
     
     db = WorkflowDatabase()
     
     if args.index:
-        stats = db.index_all_workflows(force_reindex=args.force)
+        stats = db.index_all_workflows(force_reindex=args.force, jobs=args.jobs)
         print(f"Indexed {stats['processed']} workflows")
     
+    elif args.export:
+        start_time = time.perf_counter()
+        chunks = db.export_ndjson(
+            query=args.search or "",
+            trigger_filter=args.trigger,
+            complexity_filter=args.complexity,
+            active_only=args.active_only,
+            integration_filter=args.integration,
+            category_filter=args.category
+        )
+        exported = 0
+        out = open(args.export, 'wb') if args.export != '-' else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                exported += chunk.count(b'\n')
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        # Progress goes to stderr so stdout stays valid NDJSON
+        print(f"✅ Exported {exported} workflows to {args.export if args.export != '-' else 'stdout'} "
+              f"in {time.perf_counter() - start_time:.1f}s", file=sys.stderr)
+    
     elif args.search:
         results, total = db.search_workflows(args.search, limit=10)
         print(f"Found {total} workflows:")
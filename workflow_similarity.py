@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Workflow Similarity Index
+TF-IDF vectors of each workflow's node types, integrations and name tokens,
+kept as a sparse matrix next to the SQLite database for "similar workflows".
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: without it there are no similar-workflow lookups
+    np = None
+
+# Name words too common to say anything about what a workflow does
+NAME_STOPWORDS = {
+    'and', 'the', 'for', 'with', 'from', 'into', 'via', 'using', 'your', 'when',
+    'workflow', 'automation', 'automate', 'triggered', 'scheduled', 'webhook', 'manual'
+}
+
+# Workflows read per query when vectorizing added or changed rows
+FEATURE_BATCH_SIZE = 500
+
+_NAME_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def workflow_terms(name: str, integrations: Iterable[str], node_types: Iterable[str]) -> Dict[str, int]:
+    """Term frequencies of one workflow: 'node:', 'integration:' and 'name:' prefixed terms."""
+    terms = {}
+    for node_type in node_types:
+        terms[f"node:{node_type}"] = 1
+    for integration in integrations:
+        terms[f"integration:{integration.lower()}"] = 1
+    for token in _NAME_TOKEN.findall((name or '').lower()):
+        if len(token) > 2 and token not in NAME_STOPWORDS and not token.isdigit():
+            key = f"name:{token}"
+            terms[key] = terms.get(key, 0) + 1
+    return terms
+
+
+def fingerprint(file_hash: Optional[str], has_node_types: bool) -> int:
+    """64 bits of a row's content hash; 0 for rows indexed before node types were stored."""
+    if not file_hash or not has_node_types:
+        return 0
+    return int(file_hash[:16], 16)
+
+
+class _Matrix:
+    """One immutable build of the index: CSR term counts in id order plus the weights queries read."""
+
+    def __init__(self, generation: int, terms: List[str], ids, fingerprints, indptr, indices, tf):
+        df = np.bincount(indices, minlength=len(terms))
+        # Terms no workflow uses anymore are dropped, so the vocabulary doesn't grow without bound
+        if len(terms) and not df.all():
+            live = df > 0
+            indices = (np.cumsum(live) - 1)[indices]
+            terms = [term for term, keep in zip(terms, live.tolist()) if keep]
+            df = df[live]
+        self.generation = generation
+        self.terms = terms
+        self.ids = ids.astype(np.int64)
+        self.fingerprints = fingerprints.astype(np.uint64)
+        # Workflow ids[i] has term columns indices[indptr[i]:indptr[i + 1]] with counts tf
+        self.indptr = indptr.astype(np.int64)
+        self.indices = indices.astype(np.int32)
+        self.tf = tf.astype(np.float32)
+
+        rows = np.repeat(np.arange(len(self.ids), dtype=np.int32), np.diff(self.indptr))
+        # Smoothed IDF, so a term in every workflow still counts a little
+        self.idf = (np.log((1 + len(self.ids)) / (1 + df)) + 1).astype(np.float32)
+        weights = self.tf * self.idf[self.indices]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(self.ids)))
+        self.norms = np.where(norms > 0, norms, 1).astype(np.float32)
+        # Per column, the rows containing it with their normalized weights
+        order = np.argsort(self.indices, kind='stable')
+        self.col_indptr = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+        self.col_rows = rows[order]
+        self.col_weights = (weights / self.norms[rows])[order].astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class SimilarityIndex:
+    """Cosine top-k over TF-IDF workflow vectors, saved to path and updated from the indexer's changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Queries read whichever build is current; builders replace it whole
+        self._matrix: Optional[_Matrix] = None
+        self._loaded = False
+        self._build_lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @property
+    def generation(self) -> Optional[int]:
+        matrix = self._matrix
+        return None if matrix is None else matrix.generation
+
+    def __len__(self) -> int:
+        matrix = self._matrix
+        return 0 if matrix is None else len(matrix)
+
+    def load(self) -> bool:
+        """Read the saved matrix on first use; returns whether there is one to query."""
+        if not self._loaded:
+            with self._build_lock:
+                if not self._loaded:
+                    self._matrix = self._load()
+                    self._loaded = True
+        return self._matrix is not None
+
+    def update(self, conn, generation: int, changed: Iterable[str] = (), removed_ids: Iterable[int] = (),
+               verbose: bool = False) -> bool:
+        """Apply one index run's changed filenames and removed ids to reach generation, else sync()."""
+        self.load()
+        with self._build_lock:
+            base = self._matrix
+            if base is None or base.generation != generation - 1:
+                return self._sync(conn, generation, verbose)
+            start_time = time.perf_counter()
+            changed = list(dict.fromkeys(changed))
+            terms, columns = list(base.terms), {term: column for column, term in enumerate(base.terms)}
+            rows = self._vectorize(conn, 'filename', changed, terms, columns)
+            drop = np.concatenate([rows[0], np.fromiter(removed_ids, dtype=np.int64)])
+            keep = ~np.isin(base.ids, drop)
+            self._replace(self._merge(generation, terms, base, keep, rows))
+            if verbose:
+                print(f"🔄 Similarity index: {len(rows[0])} workflows vectorized, {int((~keep).sum())} replaced "
+                      f"or removed, in {time.perf_counter() - start_time:.2f}s")
+            return True
+
+    def sync(self, conn, generation: int, verbose: bool = False) -> bool:
+        """Bring the index up to generation by comparing content hashes with the database; returns whether it changed."""
+        self.load()
+        with self._build_lock:
+            return self._sync(conn, generation, verbose)
+
+    def similar(self, workflow_id: int, k: int) -> Optional[List[Tuple[int, float]]]:
+        """Up to k (workflow id, cosine similarity) pairs most similar to workflow_id, best first; None if it isn't indexed."""
+        matrix = self._matrix
+        if matrix is None or not len(matrix):
+            return None
+        row = int(np.searchsorted(matrix.ids, workflow_id))
+        if row == len(matrix) or matrix.ids[row] != workflow_id:
+            return None
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        columns = matrix.indices[start:end]
+        query = matrix.tf[start:end] * matrix.idf[columns] / matrix.norms[row]
+
+        # Only the postings of the workflow's own terms are touched
+        scores = np.zeros(len(matrix), dtype=np.float32)
+        for column, weight in zip(columns.tolist(), query.tolist()):
+            first, last = matrix.col_indptr[column], matrix.col_indptr[column + 1]
+            scores[matrix.col_rows[first:last]] += weight * matrix.col_weights[first:last]
+        scores[row] = 0
+
+        k = min(k, len(matrix) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(matrix.ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def _sync(self, conn, generation: int, verbose: bool) -> bool:
+        base = self._matrix
+        if base is not None and base.generation == generation:
+            return False
+        # Another process may already have saved this generation
+        saved = self._load(generation)
+        if saved is not None:
+            self._matrix = saved
+            return True
+        start_time = time.perf_counter()
+
+        rows = conn.execute("SELECT id, file_hash, node_types IS NOT NULL FROM workflows ORDER BY id").fetchall()
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        fingerprints = np.fromiter((fingerprint(row[1], row[2]) for row in rows), dtype=np.uint64, count=len(rows))
+
+        # Rows still indexed with the same content keep their vectors
+        keep = np.zeros(0 if base is None else len(base), dtype=bool)
+        unchanged = np.zeros(len(ids), dtype=bool)
+        if len(keep) and len(ids):
+            position = np.minimum(np.searchsorted(base.ids, ids), len(base) - 1)
+            unchanged = (base.ids[position] == ids) & (base.fingerprints[position] == fingerprints)
+            keep[position[unchanged]] = True
+        changed = ids[~unchanged].tolist()
+
+        terms = [] if base is None else list(base.terms)
+        columns = {term: column for column, term in enumerate(terms)}
+        self._replace(self._merge(generation, terms, base, keep,
+                                  self._vectorize(conn, 'id', changed, terms, columns)))
+        if verbose:
+            print(f"🔄 Similarity index: {len(changed)} of {len(ids)} workflows vectorized, "
+                  f"{len(self._matrix.terms)} terms, in {time.perf_counter() - start_time:.2f}s")
+        return True
+
+    @staticmethod
+    def _vectorize(conn, key: str, values: List, terms: List[str], columns: Dict[str, int]):
+        """(ids, fingerprints, row lengths, columns, counts) of the rows whose key is in values, adding new terms."""
+        found = []
+        for i in range(0, len(values), FEATURE_BATCH_SIZE):
+            found.extend(conn.execute(
+                f"SELECT id, file_hash, node_types IS NOT NULL, name, integrations, node_types FROM workflows "
+                f"WHERE {key} IN (SELECT value FROM json_each(?))",
+                (json.dumps(values[i:i + FEATURE_BATCH_SIZE]),)
+            ).fetchall())
+        found.sort(key=lambda row: row[0])
+
+        lengths, indices, counts = [], [], []
+        for _, _, _, name, integrations, node_types in found:
+            row_terms = workflow_terms(name, json.loads(integrations or '[]'), json.loads(node_types or '[]'))
+            lengths.append(len(row_terms))
+            for term, count in row_terms.items():
+                column = columns.get(term)
+                if column is None:
+                    column = columns[term] = len(terms)
+                    terms.append(term)
+                indices.append(column)
+                counts.append(count)
+        return (np.array([row[0] for row in found], dtype=np.int64),
+                np.array([fingerprint(row[1], row[2]) for row in found], dtype=np.uint64),
+                np.array(lengths, dtype=np.int64), np.array(indices, dtype=np.int32),
+                np.array(counts, dtype=np.float32))
+
+    @staticmethod
+    def _merge(generation: int, terms: List[str], base: Optional[_Matrix], keep, rows) -> _Matrix:
+        """A build of base's kept rows plus the new rows, ordered by id."""
+        ids, fingerprints, lengths, indices, tf = rows
+        if base is not None and len(base):
+            old_lengths = np.diff(base.indptr)
+            kept_entries = np.repeat(keep, old_lengths)
+            ids = np.concatenate([base.ids[keep], ids])
+            fingerprints = np.concatenate([base.fingerprints[keep], fingerprints])
+            lengths = np.concatenate([old_lengths[keep], lengths])
+            indices = np.concatenate([base.indices[kept_entries], indices])
+            tf = np.concatenate([base.tf[kept_entries], tf])
+
+        # Reorder whole rows by id: each entry moves with its row's block
+        order = np.argsort(ids, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        indptr = np.concatenate([[0], np.cumsum(lengths[order])]).astype(np.int64)
+        gather = np.repeat(starts[order] - indptr[:-1], lengths[order]) + np.arange(indptr[-1])
+        return _Matrix(generation, terms, ids[order], fingerprints[order], indptr,
+                       indices[gather], tf[gather])
+
+    def _replace(self, matrix: _Matrix):
+        self._matrix = matrix
+        self._save(matrix)
+
+    def _load(self, generation: Optional[int] = None) -> Optional[_Matrix]:
+        """The saved build, or None if there is none (at generation, when given)."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                saved_generation = int(data['generation'])
+                if generation is not None and saved_generation != generation:
+                    return None
+                terms = [str(term) for term in data['terms']]
+                ids, fingerprints = data['ids'], data['fingerprints']
+                indptr, indices, tf = data['indptr'], data['indices'], data['tf']
+            if (len(indptr) != len(ids) + 1 or len(fingerprints) != len(ids) or len(indices) != len(tf)
+                    or indptr[-1] != len(indices) or (len(indices) and indices.max() >= len(terms))):
+                raise ValueError("inconsistent arrays")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Rebuilding unreadable similarity index {self.path}: {e}")
+            return None
+        return _Matrix(saved_generation, terms, ids, fingerprints, indptr, indices, tf)
+
+    def _save(self, matrix: _Matrix):
+        # A private temp file, so concurrent writers (other workers, a CLI run) never share one
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                        prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    terms=np.array(matrix.terms, dtype=str),
+                    ids=matrix.ids,
+                    fingerprints=matrix.fingerprints,
+                    indptr=matrix.indptr,
+                    indices=matrix.indices,
+                    tf=matrix.tf,
+                    generation=np.int64(matrix.generation)
+                )
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Streaming Workflow Extraction
+Pulls indexing metadata out of very large workflow files without building the full JSON tree.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterable, List, Tuple
+
+# Bytes read from the file per refill
+CHUNK_SIZE = 64 * 1024
+
+# Top-level fields analyze_workflow_file uses; everything else (pinData,
+# connections, settings, ...) is skipped without being decoded
+TOP_LEVEL_FIELDS = {'id', 'name', 'active', 'tags', 'createdAt', 'updatedAt'}
+NODE_FIELDS = {'type', 'name'}
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Body of a JSON string up to its closing quote (or a dangling backslash at the buffer end)
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_SCALAR = re.compile(r'[^,\]}\s]*')
+_DECODER = json.JSONDecoder()
+
+
+class _ChunkedJsonReader:
+    """Minimal pull parser over a binary file that keeps one chunk buffered and hashes every chunk read."""
+
+    def __init__(self, f: BinaryIO, hashers: Iterable = ()):
+        self.f = f
+        self.hashers = list(hashers)
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.size = 0
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        self.size += len(chunk)
+        for hasher in self.hashers:
+            hasher.update(chunk)
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        if not chunk:
+            self.eof = True
+            self.buf += self.decoder.decode(b'', final=True)
+            return False
+        self.buf += self.decoder.decode(chunk)
+        return True
+
+    def drain(self):
+        """Read (and hash) the rest of the file; only whitespace may follow the top-level value."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                raise ValueError(f"Extra data after the top-level value: {self.buf[self.pos]!r}")
+            if not self.fill():
+                return
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError(f"Unexpected end of JSON after {self.size} bytes")
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self.pos += 1
+
+    def read_string(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                value, end = json.decoder.scanstring(self.buf, self.pos, True)
+            except json.JSONDecodeError:
+                self.pos -= 1  # keep the opening quote across the refill
+                if not self.fill():
+                    raise
+                self.pos += 1
+                continue
+            self.pos = end
+            return value
+
+    def parse_value(self) -> Any:
+        """Decode the next value; meant for the small fields we keep."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the buffer end may continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_string(self):
+        self.expect('"')
+        while True:
+            self.pos = _STRING_BODY.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) and self.buf[self.pos] == '"':
+                self.pos += 1
+                return
+            if not self.fill():
+                raise ValueError("Unterminated string")
+
+    def skip_value(self):
+        """Consume the next value without building it."""
+        char = self.peek()
+        if char == '"':
+            self.skip_string()
+            return
+
+        if char not in '[{':
+            while True:
+                end = _SCALAR.match(self.buf, self.pos).end()
+                if end == len(self.buf) and self.fill():
+                    continue
+                if end == self.pos:
+                    raise ValueError(f"Unexpected {char!r}")
+                self.pos = end
+                return
+
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("Unexpected end of JSON inside a container")
+                continue
+            self.pos = match.start()
+            char = match.group()
+            if char == '"':
+                self.skip_string()
+                continue
+            self.pos += 1
+            depth += 1 if char in '[{' else -1
+            if depth == 0:
+                return
+
+    def iter_object(self):
+        """Yield each key of the next object, leaving the reader at its value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' but found {separator!r}")
+
+    def read_nodes(self) -> List[Dict[str, Any]]:
+        """Read a nodes array keeping only NODE_FIELDS of each node."""
+        nodes = []
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return nodes
+        while True:
+            if self.peek() != '{':
+                raise ValueError("Workflow node is not an object")
+            node = {}
+            for key in self.iter_object():
+                if key in NODE_FIELDS:
+                    node[key] = self.parse_value()
+                else:
+                    self.skip_value()
+            nodes.append(node)
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return nodes
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' but found {separator!r}")
+
+
+def extract_workflow_fields(f: BinaryIO, hashers: Iterable = ()) -> Tuple[Dict[str, Any], int]:
+    """Stream TOP_LEVEL_FIELDS and each node's type and name out of a workflow file; returns (data, file_size)."""
+    reader = _ChunkedJsonReader(f, hashers)
+    data = {}
+    for key in reader.iter_object():
+        if key == 'nodes' and reader.peek() == '[':
+            data['nodes'] = reader.read_nodes()
+        elif key in TOP_LEVEL_FIELDS or key == 'nodes':
+            data[key] = reader.parse_value()
+        else:
+            reader.skip_value()
+    reader.drain()
+    return data, reader.size
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Workflow Directory Watcher
+Keeps the SQLite index in sync with the workflows/ tree as files change.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # optional: inotify-backed events on Linux
+    Observer = None
+    FileSystemEventHandler = object
+
+from workflow_db import WorkflowDatabase
+
+# Event types that can change what the index should contain
+WATCHED_EVENT_TYPES = {'created', 'modified', 'deleted', 'moved'}
+
+
+class _WorkflowEventHandler(FileSystemEventHandler):
+    """Forward filesystem events for workflow files to a WorkflowWatcher."""
+
+    def __init__(self, watcher: 'WorkflowWatcher'):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type not in WATCHED_EVENT_TYPES:
+            return
+        if event.is_directory:
+            # Directory moves and deletes don't report the files inside them
+            if event.event_type in ('moved', 'deleted'):
+                self.watcher.request_rescan()
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher.notify(os.fsdecode(path))
+
+
+class WorkflowWatcher:
+    """Debounced watcher (watchdog, or stat polling) that incrementally reindexes touched workflow files."""
+
+    def __init__(self, db: WorkflowDatabase, workflows_dir: str = None,
+                 debounce: float = 1.0, poll_interval: float = 2.0,
+                 use_polling: Optional[bool] = None):
+        self.db = db
+        self.workflows_dir = workflows_dir or db.workflows_dir
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_polling = Observer is None if use_polling is None else use_polling
+
+        self._pending: Set[str] = set()
+        self._rescan = False
+        self._last_event = 0.0
+        self._condition = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._observer = None
+
+    @property
+    def backend(self) -> str:
+        return 'polling' if self.use_polling else 'events'
+
+    def start(self):
+        """Catch up on changes made while stopped, then start watching."""
+        if self._threads:
+            return
+        self._stopping.clear()
+
+        if self.use_polling:
+            snapshot = self._snapshot()
+            poller = threading.Thread(target=self._poll_loop, args=(snapshot,),
+                                      name='workflow-watcher-poll', daemon=True)
+            self._threads.append(poller)
+        else:
+            self._observer = Observer()
+            self._observer.schedule(_WorkflowEventHandler(self), self.workflows_dir, recursive=True)
+            self._observer.start()
+
+        indexer = threading.Thread(target=self._index_loop, name='workflow-watcher', daemon=True)
+        self._threads.append(indexer)
+        self.request_rescan()
+        for thread in self._threads:
+            thread.start()
+        print(f"👀 Watching '{self.workflows_dir}' for workflow changes ({self.backend})")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop watching and wait for an in-flight reindex to finish."""
+        self._stopping.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+            self._observer = None
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self, path: str):
+        """Record a touched path; it is reindexed once events go quiet."""
+        if not path.endswith('.json'):
+            return
+        with self._condition:
+            self._pending.add(path)
+            self._last_event = time.monotonic()
+            self._condition.notify_all()
+
+    def request_rescan(self):
+        """Schedule an incremental pass over the whole tree."""
+        with self._condition:
+            self._rescan = True
+            self._last_event = time.monotonic()
+            self._condition.notify_all()
+
+    def _index_loop(self):
+        while not self._stopping.is_set():
+            with self._condition:
+                while not (self._pending or self._rescan) and not self._stopping.is_set():
+                    self._condition.wait()
+                if self._stopping.is_set():
+                    return
+
+                # Debounce: wait until no new event has arrived for self.debounce
+                quiet_for = time.monotonic() - self._last_event
+                if quiet_for < self.debounce:
+                    self._condition.wait(self.debounce - quiet_for)
+                    continue
+
+                paths, self._pending = self._pending, set()
+                rescan, self._rescan = self._rescan, False
+
+            try:
+                if rescan:
+                    self.db.index_all_workflows()
+                else:
+                    self.db.index_workflow_files(sorted(paths))
+            except Exception as e:
+                print(f"❌ Watcher reindex failed: {e}")
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        """Stat signature of every workflow file under workflows_dir."""
+        snapshot = {}
+        for root, _, files in os.walk(self.workflows_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+        return snapshot
+
+    def _poll_loop(self, snapshot: Dict[str, Tuple[int, int, int]]):
+        while not self._stopping.wait(self.poll_interval):
+            current = self._snapshot()
+            for path in current.keys() | snapshot.keys():
+                if current.get(path) != snapshot.get(path):
+                    self.notify(path)
+            snapshot = current